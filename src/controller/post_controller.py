@@ -1,15 +1,73 @@
-from typing import List, Optional, Dict, Any
+import threading
+from typing import Callable, List, Optional, Dict, Any
 from service.reddit_service import RedditService
 from service.llm_service import LLMService
+from service.export_service import ParquetExportService
+from service.harvest_scheduler import HarvestScheduler
+from service.profiling_service import ProfileSession, ProfilingService
+
+DEFAULT_SUBREDDITS = [
+    "mcp",
+    "vibecoding",
+    "buildinpublic",
+    "aws",
+    "LlamaFarm",
+    "AgentsOfAI",
+    "ClaudeAI",
+    "Buildathon",
+]
 
 
 class PostController:
     """Controller for handling post retrieval and LLM generation workflow"""
 
-    def __init__(self):
-        """Initialize the controller with required services"""
-        self.reddit_service = RedditService()
-        self.llm_service = LLMService()
+    def __init__(
+        self,
+        reddit_service: Optional[RedditService] = None,
+        llm_service: Optional[LLMService] = None,
+        exporter: Optional[ParquetExportService] = None,
+        scheduler: Optional[HarvestScheduler] = None,
+        profiler: Optional[ProfilingService] = None,
+        reddit_service_factory: Optional[Callable[[], RedditService]] = None,
+    ):
+        """
+        Initialize the controller with required services
+
+        Args:
+            reddit_service: Reddit service shared by every thread (must be
+                thread safe; one is created per thread if None)
+            llm_service: LLM service to use (creates one if None)
+            exporter: Parquet export to append every result to (disabled if None)
+            scheduler: Adaptive harvesting scheduler used to pick posts when no
+                subreddits are given (uniform random selection if None)
+            profiler: Profiling service for runs requested with profile=True
+                (profiling is unavailable if None)
+            reddit_service_factory: Creates the per-thread Reddit services
+                (defaults to RedditService)
+        """
+        self._shared_reddit_service = reddit_service
+        self._reddit_service_factory = reddit_service_factory or RedditService
+        self._local = threading.local()
+        self.llm_service = llm_service or LLMService()
+        self.exporter = exporter
+        self.scheduler = scheduler
+        self.profiler = profiler
+
+    @property
+    def reddit_service(self) -> RedditService:
+        """
+        Reddit service of the calling thread
+
+        PRAW clients are not thread safe, so unless a shared service was
+        passed in, each thread gets its own service on first use.
+        """
+        if self._shared_reddit_service is not None:
+            return self._shared_reddit_service
+        reddit_service = getattr(self._local, "reddit_service", None)
+        if reddit_service is None:
+            reddit_service = self._reddit_service_factory()
+            self._local.reddit_service = reddit_service
+        return reddit_service
 
     def get_random_post_with_llm_response(
         self,
@@ -20,18 +78,21 @@ class PostController:
         custom_prompt: Optional[str] = None,
         model: Optional[str] = None,
         temperature: Optional[float] = None,
+        profile: bool = False,
     ) -> Dict[str, Any]:
         """
         Get a random Reddit post and generate LLM response
 
         Args:
-            subreddits: List of subreddits to search (uses default if None)
+            subreddits: List of subreddits to search (uses the scheduler or the
+                default list if None)
             limit: Maximum submissions to fetch per subreddit
             min_comments: Minimum comments required
             top_n_comments: Number of top comments to include
             custom_prompt: Custom prompt for LLM (uses default LinkedIn prompt if None)
             model: LLM model to use
             temperature: Temperature for generation
+            profile: Profile the pipeline and add the hot functions to metadata
 
         Returns:
             Dict containing submission, comments, post_summary, and llm_response
@@ -39,49 +100,47 @@ class PostController:
         Raises:
             Exception: If no suitable posts found or LLM generation fails
         """
+        use_scheduler = subreddits is None and self.scheduler is not None
+
         # Default subreddits if none provided
         if subreddits is None:
-            subreddits = [
-                "mcp",
-                "vibecoding",
-                "buildinpublic",
-                "aws",
-                "LlamaFarm",
-                "AgentsOfAI",
-                "ClaudeAI",
-                "Buildathon",
-            ]
+            subreddits = DEFAULT_SUBREDDITS
 
         try:
-            # Step 1: Get random submission
-            submission = self.reddit_service.select_random_submission(
-                subreddits=subreddits, limit=limit, min_comments=min_comments
-            )
-
-            # Step 2: Get submission with all comments
-            submission_data, comments = (
-                self.reddit_service.get_submission_with_comments(
-                    submission_id=submission.id
+            with ProfileSession(self.profiler, enabled=profile) as profile_session:
+                # Step 1: Get random submission, weighted by yield when scheduled
+                if use_scheduler:
+                    submission = self.scheduler.next_submission(
+                        min_comments=min_comments, reddit_service=self.reddit_service
+                    )
+                else:
+                    submission = self.reddit_service.select_random_submission(
+                        subreddits=subreddits, limit=limit, min_comments=min_comments
+                    )
+
+                # Step 2: Get submission with all comments
+                submission_data, comments = (
+                    self.reddit_service.get_submission_with_comments(
+                        submission_id=submission.id
+                    )
+                )
+
+                # Step 3: Generate structured post summary
+                post_summary = self.reddit_service.generate_post_summary(
+                    submission=submission_data,
+                    comments=comments,
+                    top_n_comments=top_n_comments,
+                )
+
+                # Step 4: Generate LLM response
+                llm_response = self.llm_service.generate_linkedin_post(
+                    post_summary=post_summary,
+                    custom_prompt=custom_prompt,
+                    model=model,
+                    temperature=temperature,
                 )
-            )
-
-            # Step 3: Generate structured post summary
-            post_summary = self.reddit_service.generate_post_summary(
-                submission=submission_data,
-                comments=comments,
-                top_n_comments=top_n_comments,
-            )
-
-            # Step 4: Generate LLM response
-            llm_response = self.llm_service.generate_linkedin_post(
-                post_summary=post_summary,
-                custom_prompt=custom_prompt,
-                model=model,
-                temperature=temperature,
-            )
-
-            # Return complete result
-            return {
+
+            result = {
                 "submission": submission_data,
                 "comments": comments,
                 "post_summary": post_summary,
@@ -91,9 +150,21 @@ class PostController:
                     "top_comments_used": min(top_n_comments, len(comments)),
                     "subreddit_searched": submission_data.subreddit,
                     "generation_timestamp": llm_response.timestamp,
+                    "model_routing": llm_response.routing,
+                    "profile": profile_session.summary,
                 },
             }
 
+            # Step 5: Queue the result for the Parquet export
+            if self.exporter is not None:
+                try:
+                    self.exporter.export_result(result)
+                except Exception as e:
+                    # Log error but still return the generated post
+                    print(f"Error exporting post '{submission_data.id}': {e}")
+
+            return result
+
         except Exception as e:
             raise Exception(f"Failed to generate post with LLM response: {e}")
 
@@ -1,18 +1,131 @@
-from fastapi import FastAPI
+import os
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import Literal, Optional
+from fastapi import Depends, FastAPI, Header, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
 import dotenv
-from src.controller.post_controller import PostController
+from src.controller.post_controller import DEFAULT_SUBREDDITS, PostController
+from src.model.models import SubredditConfig
+from src.service.export_service import ParquetExportService
+from src.service.harvest_scheduler import HarvestScheduler
+from src.service.profiling_service import ProfilingService
+from src.service.response_encoder import (
+    ResponseMetrics,
+    encode_response,
+    parse_fields,
+    select_fields,
+)
 
 # Load environment variables from .env file
 dotenv.load_dotenv()
 
-app = FastAPI()
-controller = PostController()
+
+@lru_cache
+def get_controller() -> PostController:
+    """Create the shared post controller on first use"""
+    export_dir = os.getenv("EXPORT_DIR")
+    exporter = None
+    if export_dir:
+        # Never make a request wait on a backed-up export
+        exporter = ParquetExportService(root_dir=export_dir, drop_when_full=True)
+    scheduler = None
+    if os.getenv("ADAPTIVE_HARVESTING"):
+        scheduler = HarvestScheduler(
+            [SubredditConfig(name=name) for name in DEFAULT_SUBREDDITS]
+        )
+    profile_dir = os.getenv("PROFILE_DIR")
+    profiler = ProfilingService(output_dir=profile_dir) if profile_dir else None
+    return PostController(exporter=exporter, scheduler=scheduler, profiler=profiler)
+
+
+def current_controller(app: FastAPI) -> Optional[PostController]:
+    """
+    Controller serving an app, honoring dependency overrides
+
+    Args:
+        app: The application
+
+    Returns:
+        The overriding controller, the shared controller if it has been
+        created, or None
+    """
+    override = app.dependency_overrides.get(get_controller)
+    if override is not None:
+        return override()
+    if get_controller.cache_info().currsize:
+        return get_controller()
+    return None
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start background harvesting and finalize the Parquet export on shutdown"""
+    if os.getenv("ADAPTIVE_HARVESTING"):
+        controller = app.dependency_overrides.get(get_controller, get_controller)()
+        if controller.scheduler:
+            controller.scheduler.start()
+    yield
+    controller = current_controller(app)
+    if controller is not None:
+        if controller.scheduler:
+            controller.scheduler.stop(timeout=5)
+        if controller.exporter:
+            controller.exporter.close()
+
+
+app = FastAPI(lifespan=lifespan)
+response_metrics = ResponseMetrics()
 
 
 @app.get("/generate-post")
-async def generate_post():
-    """Generate a random Reddit post with LLM response"""
-    return controller.get_random_post_with_llm_response()
+async def generate_post(
+    request: Request,
+    mode: Literal["full", "compact"] = "full",
+    fields: Optional[str] = None,
+    x_profile: bool = Header(default=False),
+    controller: PostController = Depends(get_controller),
+):
+    """
+    Generate a random Reddit post with LLM response
+
+    Use mode=compact to drop the comment list and post summary, or
+    fields=llm_response,metadata to pick top-level fields (only compact fields
+    may be picked in compact mode). Responses are compressed with br or gzip
+    when the client accepts it. Send "X-Profile: 1" to profile the pipeline
+    (requires PROFILE_DIR).
+    """
+    if x_profile and controller.profiler is None:
+        raise HTTPException(
+            status_code=400, detail="Profiling is unavailable: set PROFILE_DIR"
+        )
+
+    compact = mode == "compact"
+    try:
+        selected_fields = parse_fields(fields, compact=compact)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    accept_encoding = request.headers.get("accept-encoding", "")
+
+    def generate_and_encode():
+        result = controller.get_random_post_with_llm_response(profile=x_profile)
+        payload = select_fields(result, compact=compact, fields=selected_fields)
+        return encode_response(payload, accept_encoding, response_metrics)
+
+    # Reddit, the LLM and serialization all block, so keep them off the event loop
+    body, headers = await run_in_threadpool(generate_and_encode)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@app.get("/metrics")
+async def metrics(request: Request):
+    """Report response sizes, serialization time and harvesting yield"""
+    report = {"responses": response_metrics.snapshot()}
+    controller = current_controller(request.app)
+    if controller is not None and controller.scheduler:
+        report["harvesting"] = controller.scheduler.report()
+    return report
 
 
 if __name__ == "__main__":
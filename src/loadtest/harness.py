@@ -0,0 +1,299 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+import httpx
+from loadtest.metrics import LoopLagMonitor, summarize
+from loadtest.stubs import STUB_CONFIG_ENV, StubConfig, create_stub_app
+
+SRC_DIR = Path(__file__).resolve().parents[1]
+REPO_DIR = SRC_DIR.parent
+
+
+async def _timed_request(
+    client: httpx.AsyncClient,
+    path: str,
+    results: List[Tuple[float, bool]],
+    start: float,
+) -> None:
+    """Issue one request and record its latency measured from its arrival time"""
+    try:
+        response = await client.get(path)
+        ok = response.status_code == 200
+    except httpx.HTTPError:
+        ok = False
+    results.append((time.perf_counter() - start, ok))
+
+
+async def run_closed_loop(
+    client: httpx.AsyncClient, path: str, concurrency: int, duration: float
+) -> List[Tuple[float, bool]]:
+    """
+    Keep a fixed number of requests in flight until the duration elapses
+
+    Args:
+        client: HTTP client bound to the app under test
+        path: Request path
+        concurrency: Number of concurrent virtual users
+        duration: Seconds to keep issuing new requests
+
+    Returns:
+        List of (latency seconds, succeeded) per request
+    """
+    results: List[Tuple[float, bool]] = []
+    deadline = time.perf_counter() + duration
+
+    async def user() -> None:
+        while time.perf_counter() < deadline:
+            await _timed_request(client, path, results, time.perf_counter())
+
+    await asyncio.gather(*(user() for _ in range(concurrency)))
+    return results
+
+
+async def run_open_loop(
+    client: httpx.AsyncClient, path: str, rate: float, concurrency: int, duration: float
+) -> List[Tuple[float, bool]]:
+    """
+    Issue requests with Poisson arrivals at a target rate
+
+    Latency is measured from each request's scheduled arrival, so time spent
+    waiting for a free slot counts against the server.
+
+    Args:
+        client: HTTP client bound to the app under test
+        path: Request path
+        rate: Mean arrivals per second
+        concurrency: Maximum requests in flight
+        duration: Seconds to keep generating arrivals
+
+    Returns:
+        List of (latency seconds, succeeded) per request
+    """
+    results: List[Tuple[float, bool]] = []
+    slots = asyncio.Semaphore(concurrency)
+    tasks = []
+
+    async def arrival(start: float) -> None:
+        async with slots:
+            await _timed_request(client, path, results, start)
+
+    deadline = time.perf_counter() + duration
+    next_arrival = time.perf_counter()
+    while next_arrival < deadline:
+        await asyncio.sleep(max(0.0, next_arrival - time.perf_counter()))
+        tasks.append(asyncio.create_task(arrival(next_arrival)))
+        next_arrival += random.expovariate(rate)
+
+    await asyncio.gather(*tasks)
+    return results
+
+
+def build_report(
+    results: List[Tuple[float, bool]],
+    elapsed: float,
+    loop_lag: Dict[str, Any],
+) -> Dict[str, Any]:
+    """
+    Summarize a load test run
+
+    Args:
+        results: (latency seconds, succeeded) per request
+        elapsed: Wall-clock seconds the run took
+        loop_lag: Event-loop lag summary (per worker pid when out of process)
+
+    Returns:
+        Dict with throughput, latency percentiles, error rate and loop lag
+    """
+    successes = [latency for latency, ok in results if ok]
+    errors = len(results) - len(successes)
+    return {
+        "requests": len(results),
+        "errors": errors,
+        "error_rate": errors / len(results) if results else 0.0,
+        "elapsed_seconds": elapsed,
+        "throughput_rps": len(successes) / elapsed if elapsed else 0.0,
+        "latency_seconds": summarize(successes),
+        "loop_lag_seconds": loop_lag,
+    }
+
+
+async def _drive(
+    client: httpx.AsyncClient, args: argparse.Namespace
+) -> Tuple[List[Tuple[float, bool]], float]:
+    started = time.perf_counter()
+    if args.rate:
+        results = await run_open_loop(
+            client, args.path, args.rate, args.concurrency, args.duration
+        )
+    else:
+        results = await run_closed_loop(
+            client, args.path, args.concurrency, args.duration
+        )
+    return results, time.perf_counter() - started
+
+
+async def run_in_process(args: argparse.Namespace, config: StubConfig) -> Dict:
+    """Drive the app in this process, sharing its event loop"""
+    app = create_stub_app(config)
+    monitor = LoopLagMonitor()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://loadtest", timeout=args.timeout
+    ) as client:
+        monitor.start()
+        results, elapsed = await _drive(client, args)
+        await monitor.stop()
+    return build_report(results, elapsed, monitor.summary())
+
+
+async def _collect_worker_lag(client: httpx.AsyncClient, workers: int) -> Dict:
+    """Poll the stats endpoint until every worker has likely answered"""
+    per_worker: Dict[str, Dict[str, float]] = {}
+    for _ in range(workers * 4):
+        try:
+            # A fresh connection per poll lets the kernel pick another worker
+            response = await client.get(
+                "/_loadtest/stats", headers={"Connection": "close"}
+            )
+            stats = response.json()
+            per_worker[str(stats["pid"])] = stats["loop_lag"]
+        except (httpx.HTTPError, ValueError, KeyError):
+            continue
+    return per_worker
+
+
+async def run_with_workers(args: argparse.Namespace, config: StubConfig) -> Dict:
+    """Drive the app served by uvicorn with the given number of worker processes"""
+    env = dict(os.environ)
+    env[STUB_CONFIG_ENV] = config.model_dump_json()
+    env["PYTHONPATH"] = os.pathsep.join(
+        [str(SRC_DIR), str(REPO_DIR), env.get("PYTHONPATH", "")]
+    )
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "loadtest.stubs:create_stub_app",
+            "--factory",
+            "--host",
+            "127.0.0.1",
+            "--port",
+            str(args.port),
+            "--workers",
+            str(args.workers),
+            "--log-level",
+            "warning",
+        ],
+        cwd=REPO_DIR,
+        env=env,
+    )
+    try:
+        async with httpx.AsyncClient(
+            base_url=f"http://127.0.0.1:{args.port}", timeout=args.timeout
+        ) as client:
+            # Wait for the server to come up
+            for _ in range(120):
+                try:
+                    await client.get("/_loadtest/stats")
+                    break
+                except httpx.HTTPError:
+                    await asyncio.sleep(0.25)
+            else:
+                raise RuntimeError("uvicorn did not start within 30 seconds")
+
+            results, elapsed = await _drive(client, args)
+            loop_lag = await _collect_worker_lag(client, args.workers)
+    finally:
+        server.terminate()
+        server.wait()
+    return build_report(results, elapsed, loop_lag)
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """Format a load test report for the terminal"""
+    latency = report["latency_seconds"]
+    lines = [
+        f"requests:    {report['requests']} ({report['errors']} errors, "
+        f"{report['error_rate']:.1%})",
+        f"elapsed:     {report['elapsed_seconds']:.1f}s",
+        f"throughput:  {report['throughput_rps']:.2f} req/s",
+        f"latency:     p50 {latency['p50']:.3f}s  p95 {latency['p95']:.3f}s  "
+        f"p99 {latency['p99']:.3f}s  max {latency['max']:.3f}s",
+    ]
+    loop_lag = report["loop_lag_seconds"]
+    lag_by_source = loop_lag if "p50" not in loop_lag else {"in-process": loop_lag}
+    for source, lag in lag_by_source.items():
+        lines.append(
+            f"loop lag:    [{source}] p50 {lag['p50']:.3f}s  p99 {lag['p99']:.3f}s  "
+            f"max {lag['max']:.3f}s"
+        )
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Load test /generate-post against offline Reddit and Gemini stubs"
+    )
+    parser.add_argument("--path", default="/generate-post", help="Request path")
+    parser.add_argument(
+        "--concurrency", type=int, default=8, help="Virtual users (max in flight)"
+    )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        help="Open-loop arrivals per second (closed loop if unset)",
+    )
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds to run")
+    parser.add_argument(
+        "--timeout", type=float, default=120.0, help="Per-request timeout in seconds"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=0,
+        help="Uvicorn worker processes (0 runs the app in-process)",
+    )
+    parser.add_argument("--port", type=int, default=8765, help="Port for --workers")
+    parser.add_argument("--stub-config", help="JSON file overriding StubConfig fields")
+    parser.add_argument(
+        "--latency-scale",
+        type=float,
+        default=1.0,
+        help="Multiply every stub latency (e.g. 0.1 for a quick smoke run)",
+    )
+    parser.add_argument("--json", dest="json_path", help="Also write the report here")
+    args = parser.parse_args()
+
+    overrides: Dict[str, Any] = {}
+    if args.stub_config:
+        with open(args.stub_config, "r", encoding="utf-8") as f:
+            overrides = json.load(f)
+    config = StubConfig(**overrides)
+    if args.latency_scale != 1.0:
+        config.reddit_listing_latency *= args.latency_scale
+        config.reddit_submission_latency *= args.latency_scale
+        config.llm_default_latency *= args.latency_scale
+        config.llm_latencies = {
+            model: latency * args.latency_scale
+            for model, latency in config.llm_latencies.items()
+        }
+
+    runner = run_with_workers if args.workers > 0 else run_in_process
+    report = asyncio.run(runner(args, config))
+
+    print(format_report(report))
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+import asyncio
+import math
+import time
+from collections import deque
+from typing import Dict, List, Optional
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """
+    Nearest-rank percentile of a list of values
+
+    Args:
+        values: Sample values (need not be sorted)
+        pct: Percentile between 0 and 100
+
+    Returns:
+        float: The percentile value, or 0.0 for an empty sample
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def summarize(values: List[float]) -> Dict[str, float]:
+    """
+    Summarize a sample as p50/p95/p99/max
+
+    Args:
+        values: Sample values
+
+    Returns:
+        Dict of summary statistics
+    """
+    return {
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+        "max": max(values) if values else 0.0,
+    }
+
+
+class LoopLagMonitor:
+    """Measures how late the event loop wakes up from a fixed-interval sleep"""
+
+    def __init__(self, interval: float = 0.05, max_samples: int = 10000):
+        """
+        Initialize the monitor
+
+        Args:
+            interval: Seconds between probes
+            max_samples: Number of most recent lag samples to keep
+        """
+        self.interval = interval
+        self.samples: deque = deque(maxlen=max_samples)
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Start probing on the running event loop (no-op if already started)"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._probe())
+
+    async def stop(self) -> None:
+        """Stop probing"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _probe(self) -> None:
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            lag = time.perf_counter() - started - self.interval
+            self.samples.append(max(0.0, lag))
+
+    def reset(self) -> None:
+        """Discard collected samples"""
+        self.samples.clear()
+
+    def summary(self) -> Dict[str, float]:
+        """Summarize the collected lag samples in seconds"""
+        return summarize(list(self.samples))
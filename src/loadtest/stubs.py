@@ -0,0 +1,251 @@
+import math
+import os
+import random
+import time
+from types import SimpleNamespace
+from typing import Dict, List, Optional
+from pydantic import BaseModel, Field
+from controller.post_controller import PostController
+from service.llm_service import LLMService
+from service.reddit_service import RedditService
+from loadtest.metrics import LoopLagMonitor
+
+STUB_CONFIG_ENV = "LOADTEST_STUB_CONFIG"
+
+
+class StubConfig(BaseModel):
+    """Latencies and data shape for the offline Reddit and Gemini stand-ins"""
+
+    reddit_listing_latency: float = Field(
+        default=0.3, ge=0.0, description="Mean seconds to fetch a hot listing"
+    )
+    reddit_submission_latency: float = Field(
+        default=0.8, ge=0.0, description="Mean seconds to fetch a comment tree"
+    )
+    llm_latencies: Dict[str, float] = Field(
+        default_factory=lambda: {
+            "gemini-2.5-pro": 6.0,
+            "gemini-2.5-flash": 2.0,
+            "gemini-2.5-flash-lite": 0.8,
+        },
+        description="Mean seconds per Gemini call, by model",
+    )
+    llm_default_latency: float = Field(
+        default=6.0, ge=0.0, description="Mean seconds for models not listed above"
+    )
+    latency_jitter: float = Field(
+        default=0.25, ge=0.0, description="Log-normal sigma applied to latencies"
+    )
+    llm_error_rate: float = Field(
+        default=0.0, ge=0.0, le=1.0, description="Fraction of Gemini calls that fail"
+    )
+    listing_size: int = Field(default=25, ge=1, description="Submissions per listing")
+    comments_per_thread: int = Field(
+        default=60, ge=0, description="Comments in each generated thread"
+    )
+    max_depth: int = Field(default=4, ge=1, description="Maximum reply depth")
+
+
+def _sleep(mean: float, jitter: float) -> None:
+    """Block for a log-normally distributed duration with the given mean"""
+    if mean <= 0:
+        return
+    if jitter <= 0:
+        time.sleep(mean)
+        return
+    mu = math.log(mean) - jitter**2 / 2
+    time.sleep(random.lognormvariate(mu, jitter))
+
+
+def _build_comment_tree(
+    submission_id: str, config: StubConfig
+) -> List[SimpleNamespace]:
+    """Build a random PRAW-like comment forest for a submission"""
+    top_level: List[SimpleNamespace] = []
+    nodes: List[SimpleNamespace] = []
+    for i in range(config.comments_per_thread):
+        comment = SimpleNamespace(
+            id=f"{submission_id}c{i}",
+            author=SimpleNamespace(name=f"user{random.randrange(1000)}"),
+            body=f"Comment {i} on {submission_id}. " * random.randint(1, 12),
+            score=random.randint(-5, 500),
+            replies=[],
+            depth=0,
+        )
+        candidates = [n for n in nodes if n.depth < config.max_depth - 1]
+        if candidates and random.random() < 0.6:
+            parent = random.choice(candidates)
+            comment.depth = parent.depth + 1
+            parent.replies.append(comment)
+        else:
+            top_level.append(comment)
+        nodes.append(comment)
+    return top_level
+
+
+class _StubCommentForest(list):
+    """PRAW CommentForest stand-in"""
+
+    def replace_more(self, limit: Optional[int] = 32) -> list:
+        return []
+
+
+class _StubSubmission:
+    """PRAW Submission stand-in that loads its comments lazily"""
+
+    def __init__(self, submission_id: str, subreddit: str, config: StubConfig):
+        self.id = submission_id
+        self.subreddit = SimpleNamespace(display_name=subreddit)
+        self.title = f"Stub thread {submission_id} in r/{subreddit}"
+        self.selftext = "What do you all think about this? " * random.randint(1, 8)
+        self.score = random.randint(0, 5000)
+        self.num_comments = config.comments_per_thread
+        self._config = config
+        self._comments: Optional[_StubCommentForest] = None
+
+    @property
+    def comments(self) -> _StubCommentForest:
+        if self._comments is None:
+            _sleep(self._config.reddit_submission_latency, self._config.latency_jitter)
+            self._comments = _StubCommentForest(
+                _build_comment_tree(self.id, self._config)
+            )
+        return self._comments
+
+
+class _StubReddit:
+    """praw.Reddit stand-in serving generated listings and threads"""
+
+    def __init__(self, config: StubConfig):
+        self.config = config
+
+    def subreddit(self, name: str) -> SimpleNamespace:
+        def hot(limit: int = 10):
+            _sleep(self.config.reddit_listing_latency, self.config.latency_jitter)
+            for _ in range(min(limit, self.config.listing_size)):
+                yield _StubSubmission(f"s{random.getrandbits(32):x}", name, self.config)
+
+        return SimpleNamespace(hot=hot, new=hot, top=hot, rising=hot)
+
+    def submission(self, id: str) -> _StubSubmission:
+        return _StubSubmission(id, "stub", self.config)
+
+
+class StubRedditService(RedditService):
+    """RedditService backed by generated data with injected latency"""
+
+    def __init__(self, config: Optional[StubConfig] = None):
+        """
+        Initialize stub Reddit service
+
+        Args:
+            config: Stand-in latencies and data shape (uses defaults if None)
+        """
+        self.reddit = _StubReddit(config or StubConfig())
+
+
+class _StubChatModel:
+    """ChatGoogleGenerativeAI stand-in"""
+
+    def __init__(self, model: str, config: StubConfig):
+        self.model = model
+        self.config = config
+
+    def invoke(self, prompt: str) -> SimpleNamespace:
+        mean = self.config.llm_latencies.get(
+            self.model, self.config.llm_default_latency
+        )
+        _sleep(mean, self.config.latency_jitter)
+        if random.random() < self.config.llm_error_rate:
+            raise RuntimeError("Injected Gemini failure")
+        return SimpleNamespace(
+            content=f"Stub post from {self.model} for {len(prompt)} prompt chars"
+        )
+
+
+class StubLLMService(LLMService):
+    """LLMService answering with a stand-in Gemini client"""
+
+    def __init__(self, config: Optional[StubConfig] = None, **kwargs):
+        """
+        Initialize stub LLM service
+
+        Args:
+            config: Stand-in latencies (uses defaults if None)
+            **kwargs: Forwarded to LLMService
+        """
+        self.stub_config = config or StubConfig()
+        super().__init__(**kwargs)
+
+    def _validate_api_key(self) -> None:
+        """No API key is needed offline"""
+
+    def _create_llm_client(self, model: str, temperature: float) -> _StubChatModel:
+        return _StubChatModel(model, self.stub_config)
+
+
+def create_stub_controller(config: Optional[StubConfig] = None) -> PostController:
+    """
+    Create a PostController wired to the offline stand-ins
+
+    Args:
+        config: Stand-in latencies and data shape (uses defaults if None)
+
+    Returns:
+        PostController: Controller that makes no network calls
+    """
+    config = config or StubConfig()
+    return PostController(
+        reddit_service_factory=lambda: StubRedditService(config),
+        llm_service=StubLLMService(config),
+    )
+
+
+def create_stub_app(config: Optional[StubConfig] = None):
+    """
+    Uvicorn factory serving the real FastAPI app against the stand-ins
+
+    Each call builds a fresh application carrying the real routes and
+    lifespan, so the global app is left untouched. The lifespan resolves the
+    controller through the override, so background harvesting and export
+    finalization never run against live services. When no config
+    is passed it is read from the LOADTEST_STUB_CONFIG environment variable,
+    so every uvicorn worker process builds the same stand-ins. Each worker
+    reports its event-loop lag on /_loadtest/stats.
+
+    Args:
+        config: Stand-in latencies and data shape
+
+    Returns:
+        FastAPI: The application with its controller dependency overridden
+    """
+    from fastapi import FastAPI
+    import fastapi_app
+    from fastapi_app import get_controller
+
+    app = FastAPI()
+    app.include_router(fastapi_app.app.router)
+
+    if config is None:
+        raw_config = os.getenv(STUB_CONFIG_ENV)
+        config = (
+            StubConfig.model_validate_json(raw_config) if raw_config else StubConfig()
+        )
+    controller = create_stub_controller(config)
+    app.dependency_overrides[get_controller] = lambda: controller
+
+    monitor = LoopLagMonitor()
+
+    @app.middleware("http")
+    async def start_lag_monitor(request, call_next):
+        monitor.start()
+        return await call_next(request)
+
+    @app.get("/_loadtest/stats", include_in_schema=False)
+    async def loadtest_stats(reset: bool = False):
+        stats = {"pid": os.getpid(), "loop_lag": monitor.summary()}
+        if reset:
+            monitor.reset()
+        return stats
+
+    return app
@@ -17,6 +17,47 @@ class RedditSubmission(BaseModel):
         json_encoders = {datetime: lambda v: v.isoformat()}
 
 
+class SubredditConfig(BaseModel):
+    """Model for a subreddit the harvesting scheduler polls"""
+
+    name: str = Field(..., description="The subreddit name")
+    max_posts: int = Field(default=10, ge=1, description="Submissions per fetch")
+    min_upvotes: int = Field(default=0, description="Minimum submission score")
+    min_comments: int = Field(
+        default=10, ge=0, description="Minimum comments for a qualifying post"
+    )
+    active: bool = Field(default=True, description="Whether the subreddit is polled")
+    last_scraped: Optional[datetime] = Field(
+        None, description="When the subreddit was last fetched"
+    )
+
+
+class SubredditYield(BaseModel):
+    """Model for the observed harvesting yield of a subreddit"""
+
+    fetches: int = Field(default=0, description="Listing fetches made")
+    qualifying_posts: int = Field(default=0, description="Qualifying posts found")
+    total_comments: int = Field(
+        default=0, description="Comments across all qualifying posts"
+    )
+    failures: int = Field(
+        default=0, description="Fetches that found no qualifying posts or errored"
+    )
+    recent_yield: Optional[float] = Field(
+        None, description="Exponentially weighted qualifying posts per fetch"
+    )
+    recent_failure_rate: Optional[float] = Field(
+        None, description="Exponentially weighted share of failed fetches"
+    )
+
+    @property
+    def avg_comments(self) -> float:
+        """Average comment count of qualifying posts"""
+        if not self.qualifying_posts:
+            return 0.0
+        return self.total_comments / self.qualifying_posts
+
+
 class RedditComment(BaseModel):
     """Model for Reddit comment data with hierarchical structure"""
 
@@ -52,6 +93,16 @@ class PostSummary(BaseModel):
         description="Top-level comments with their nested structure",
     )
 
+    def count_comments(self) -> int:
+        """Count all comments in the summary, including nested replies"""
+        count = 0
+        stack = list(self.children)
+        while stack:
+            structure = stack.pop()
+            count += 1
+            stack.extend(structure.children or [])
+        return count
+
 
 class LLMRequest(BaseModel):
     """Model for LLM API requests"""
@@ -66,6 +117,41 @@ class LLMRequest(BaseModel):
     )
 
 
+class ModelRoutingRule(BaseModel):
+    """Model for a rule routing small enough contexts to a specific LLM model"""
+
+    model: str = Field(..., description="The LLM model to use when the rule matches")
+    max_context_chars: Optional[int] = Field(
+        None, ge=0, description="Maximum serialized context size (None for no limit)"
+    )
+    max_comments: Optional[int] = Field(
+        None, ge=0, description="Maximum comments in the summary (None for no limit)"
+    )
+
+    def matches(self, context_chars: int, comment_count: int) -> bool:
+        """Check whether a context of the given size falls under this rule"""
+        if self.max_context_chars is not None:
+            if context_chars > self.max_context_chars:
+                return False
+        if self.max_comments is not None and comment_count > self.max_comments:
+            return False
+        return True
+
+
+class RoutingDecision(BaseModel):
+    """Model for the outcome of routing a request to an LLM model"""
+
+    model: str = Field(..., description="The model selected for the request")
+    reason: str = Field(
+        ..., description="Why the model was selected (rule, explicit or default)"
+    )
+    rule_index: Optional[int] = Field(
+        None, description="Index of the matching routing rule, if any"
+    )
+    context_chars: int = Field(..., description="Size of the serialized context")
+    comment_count: int = Field(..., description="Number of comments in the summary")
+
+
 class LLMResponse(BaseModel):
     """Model for LLM API responses"""
 
@@ -76,6 +162,40 @@ class LLMResponse(BaseModel):
     timestamp: datetime = Field(
         default_factory=datetime.utcnow, description="When the response was generated"
     )
+    routing: Optional[RoutingDecision] = Field(
+        None, description="How the model was selected for this response"
+    )
+
+
+class HotFunction(BaseModel):
+    """Model for a function's share of a profiled run"""
+
+    function: str = Field(..., description="The function name")
+    location: str = Field(..., description="Source file and line of the function")
+    samples: int = Field(..., description="Samples with the function on top")
+    total_time: float = Field(
+        ..., description="Estimated seconds spent in the function itself"
+    )
+    cumulative_time: float = Field(
+        ..., description="Estimated seconds spent in the function and its callees"
+    )
+
+
+class ProfileSummary(BaseModel):
+    """Model for the summary of a profiled pipeline run"""
+
+    profile_id: str = Field(..., description="Identifier of the saved profile")
+    path: Optional[str] = Field(
+        None, description="Where the collapsed stacks were saved"
+    )
+    duration_seconds: float = Field(..., description="Wall-clock time profiled")
+    samples: int = Field(default=0, description="Stack samples taken")
+    interval_seconds: float = Field(
+        default=0.0, description="Seconds between stack samples"
+    )
+    hot_functions: List[HotFunction] = Field(
+        default_factory=list, description="Functions with the most self time"
+    )
 
 
 # Enable forward references for recursive models
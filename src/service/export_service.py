@@ -0,0 +1,546 @@
+import argparse
+import os
+import queue
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+import pyarrow as pa
+import pyarrow.parquet as pq
+from model.models import LLMResponse, RedditComment, RedditSubmission
+
+SUBMISSION_SCHEMA = pa.schema(
+    [
+        ("id", pa.string()),
+        ("title", pa.string()),
+        ("body", pa.string()),
+        ("score", pa.int64()),
+        ("num_comments", pa.int64()),
+        ("harvested_at", pa.timestamp("us")),
+    ]
+)
+
+COMMENT_SCHEMA = pa.schema(
+    [
+        ("id", pa.string()),
+        ("submission_id", pa.string()),
+        ("parent_id", pa.string()),
+        ("depth", pa.int32()),
+        ("author", pa.string()),
+        ("body", pa.string()),
+        ("score", pa.int64()),
+        ("num_children", pa.int32()),
+        ("harvested_at", pa.timestamp("us")),
+    ]
+)
+
+GENERATION_SCHEMA = pa.schema(
+    [
+        ("submission_id", pa.string()),
+        ("model_used", pa.string()),
+        ("routing_reason", pa.string()),
+        ("context_chars", pa.int64()),
+        ("comment_count", pa.int64()),
+        ("content", pa.string()),
+        ("timestamp", pa.timestamp("us")),
+    ]
+)
+
+SCHEMAS = {
+    "submissions": SUBMISSION_SCHEMA,
+    "comments": COMMENT_SCHEMA,
+    "generations": GENERATION_SCHEMA,
+}
+
+PartitionKey = Tuple[str, str, str]
+
+# Queued by close() to tell the writer thread to flush and exit
+_STOP = object()
+
+
+def flatten_comments(
+    submission_id: str, comments: List[RedditComment]
+) -> Iterator[Tuple[RedditComment, str, int]]:
+    """
+    Walk a comment list as a tree, yielding each comment with its parent and depth
+
+    Top-level comments have the submission ID as their parent and depth 0.
+
+    Args:
+        submission_id: ID of the submission the comments belong to
+        comments: Comments as returned by RedditService.get_submission_with_comments
+
+    Yields:
+        Tuple of (comment, parent ID, depth)
+    """
+    comment_lookup = {comment.id: comment for comment in comments}
+    child_ids = {child_id for comment in comments for child_id in comment.children}
+
+    stack = [
+        (comment, submission_id, 0)
+        for comment in reversed(comments)
+        if comment.id not in child_ids
+    ]
+    while stack:
+        comment, parent_id, depth = stack.pop()
+        yield comment, parent_id, depth
+        for child_id in reversed(comment.children):
+            if child_id in comment_lookup:
+                stack.append((comment_lookup[child_id], comment.id, depth + 1))
+
+
+class ParquetExportService:
+    """Appends harvested submissions, comments and generations to Parquet files"""
+
+    def __init__(
+        self,
+        root_dir: str = "data/export",
+        row_group_size: int = 10000,
+        max_buffered_rows: int = 50000,
+        flush_interval: float = 300.0,
+        max_queue_size: int = 1000,
+        drop_when_full: bool = False,
+        compact_on_close: bool = True,
+    ):
+        """
+        Initialize export service
+
+        Data is written as root_dir/<table>/subreddit=<name>/date=<YYYY-MM-DD>/
+        part-<id>.parquet, which pandas.read_parquet and pyarrow datasets read
+        back with subreddit and date as partition columns.
+
+        Records are converted and written on a background thread, so callers
+        only enqueue them. Every flush writes a complete file under a hidden
+        temporary name and renames it into place, so the dataset is readable
+        while the app runs and a killed process loses at most the rows
+        buffered since the last flush. Each flush adds a part file, so
+        close() compacts the partitions written since the exporter started
+        into one file each.
+
+        Args:
+            root_dir: Directory to write the partitioned dataset to
+            row_group_size: Rows per row group and per partition before flushing it
+            max_buffered_rows: Rows buffered across all partitions before flushing
+            flush_interval: Seconds buffered rows may wait before being flushed
+            max_queue_size: Records waiting for the writer thread
+            drop_when_full: Drop records instead of waiting when the queue is full
+            compact_on_close: Merge the part files of written partitions on close
+        """
+        self.root_dir = root_dir
+        self.row_group_size = row_group_size
+        self.max_buffered_rows = max_buffered_rows
+        self.flush_interval = flush_interval
+        self.drop_when_full = drop_when_full
+        self.compact_on_close = compact_on_close
+        self.dropped_records = 0
+        # Partition directories written to, mapped to their table name
+        self._written: Dict[str, str] = {}
+        self._buffers: Dict[PartitionKey, List[Dict[str, Any]]] = {}
+        self._buffered_since: Dict[PartitionKey, float] = {}
+        self._buffered_rows = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue_size)
+        self._thread = threading.Thread(
+            target=self._run, name="parquet-export", daemon=True
+        )
+        self._thread.start()
+
+    def __enter__(self) -> "ParquetExportService":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def export_submission(
+        self,
+        submission: RedditSubmission,
+        comments: List[RedditComment],
+        harvested_at: Optional[datetime] = None,
+    ) -> None:
+        """
+        Queue a submission and its flattened comment tree for export
+
+        Args:
+            submission: The Reddit submission
+            comments: All comments of the submission
+            harvested_at: When the data was fetched (defaults to now, UTC)
+        """
+        harvested_at = harvested_at or datetime.now(timezone.utc).replace(tzinfo=None)
+        self._submit(
+            lambda: self._append_submission(submission, comments, harvested_at)
+        )
+
+    def export_generation(
+        self, submission: RedditSubmission, llm_response: LLMResponse
+    ) -> None:
+        """
+        Queue a generated response for a submission for export
+
+        Args:
+            submission: The submission the content was generated from
+            llm_response: The generated content and metadata
+        """
+        self._submit(lambda: self._append_generation(submission, llm_response))
+
+    def export_result(self, result: Dict[str, Any]) -> None:
+        """
+        Queue everything from a PostController result for export
+
+        Args:
+            result: Dict returned by PostController.get_random_post_with_llm_response
+        """
+        self.export_submission(result["submission"], result["comments"])
+        self.export_generation(result["submission"], result["llm_response"])
+
+    def flush(self) -> None:
+        """Write every queued and buffered row to complete Parquet files"""
+        self._call_on_writer(self._flush_all)
+
+    def compact(self, all_partitions: bool = False) -> int:
+        """
+        Flush, then merge the part files of each partition into a single file
+
+        The merged file is renamed into place before the parts it replaces are
+        removed, so a reader listing the partition in between can see rows
+        twice.
+
+        Args:
+            all_partitions: Compact every partition under root_dir instead of
+                only those written by this exporter
+
+        Returns:
+            int: Number of partitions compacted
+        """
+
+        def flush_and_compact() -> int:
+            self._flush_all()
+            return self._compact(all_partitions)
+
+        return self._call_on_writer(flush_and_compact) or 0
+
+    def close(self) -> None:
+        """Flush everything, compact written partitions and stop the writer"""
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join()
+
+    def _call_on_writer(self, func: Callable[[], Any]) -> Any:
+        """Run a function on the writer thread and wait for its result"""
+        if not self._thread.is_alive():
+            return None
+        done = threading.Event()
+        result = []
+
+        def task() -> None:
+            try:
+                result.append(func())
+            finally:
+                done.set()
+
+        self._queue.put(task)
+        done.wait()
+        return result[0] if result else None
+
+    def _submit(self, task: Callable[[], None]) -> None:
+        try:
+            self._queue.put(task, block=not self.drop_when_full)
+        except queue.Full:
+            self.dropped_records += 1
+            print("Export queue full, dropping record")
+
+    def _run(self) -> None:
+        """Writer thread: apply queued records and flush partitions that aged out"""
+        while True:
+            try:
+                task = self._queue.get(timeout=min(self.flush_interval, 1.0))
+            except queue.Empty:
+                task = None
+            if task is _STOP:
+                self._flush_all()
+                if self.compact_on_close:
+                    self._compact()
+                return
+            if task is not None:
+                try:
+                    task()
+                except Exception as e:
+                    # Log error but keep the writer thread alive
+                    print(f"Error exporting record: {e}")
+            self._flush_expired()
+
+    def _append_submission(
+        self,
+        submission: RedditSubmission,
+        comments: List[RedditComment],
+        harvested_at: datetime,
+    ) -> None:
+        date = harvested_at.date().isoformat()
+        self._append(
+            ("submissions", submission.subreddit, date),
+            [
+                {
+                    "id": submission.id,
+                    "title": submission.title,
+                    "body": submission.body,
+                    "score": submission.score,
+                    "num_comments": submission.comments,
+                    "harvested_at": harvested_at,
+                }
+            ],
+        )
+        self._append(
+            ("comments", submission.subreddit, date),
+            [
+                {
+                    "id": comment.id,
+                    "submission_id": submission.id,
+                    "parent_id": parent_id,
+                    "depth": depth,
+                    "author": comment.author,
+                    "body": comment.body,
+                    "score": comment.score,
+                    "num_children": len(comment.children),
+                    "harvested_at": harvested_at,
+                }
+                for comment, parent_id, depth in flatten_comments(
+                    submission.id, comments
+                )
+            ],
+        )
+
+    def _append_generation(
+        self, submission: RedditSubmission, llm_response: LLMResponse
+    ) -> None:
+        routing = llm_response.routing
+        self._append(
+            (
+                "generations",
+                submission.subreddit,
+                llm_response.timestamp.date().isoformat(),
+            ),
+            [
+                {
+                    "submission_id": submission.id,
+                    "model_used": llm_response.model_used,
+                    "routing_reason": routing.reason if routing else None,
+                    "context_chars": routing.context_chars if routing else None,
+                    "comment_count": routing.comment_count if routing else None,
+                    "content": llm_response.content,
+                    "timestamp": llm_response.timestamp,
+                }
+            ],
+        )
+
+    def _append(self, key: PartitionKey, rows: List[Dict[str, Any]]) -> None:
+        if not rows:
+            return
+        buffer = self._buffers.setdefault(key, [])
+        self._buffered_since.setdefault(key, time.monotonic())
+        buffer.extend(rows)
+        self._buffered_rows += len(rows)
+
+        if len(buffer) >= self.row_group_size:
+            self._write_partition(key)
+        if self._buffered_rows >= self.max_buffered_rows:
+            self._flush_all()
+
+    def _flush_all(self) -> None:
+        for key in list(self._buffers):
+            self._write_partition(key)
+
+    def _flush_expired(self) -> None:
+        cutoff = time.monotonic() - self.flush_interval
+        for key, since in list(self._buffered_since.items()):
+            if since <= cutoff:
+                self._write_partition(key)
+
+    def _write_partition(self, key: PartitionKey) -> None:
+        """Write one partition's buffer to a new, finalized part file"""
+        rows = self._buffers.pop(key, [])
+        self._buffered_since.pop(key, None)
+        self._buffered_rows -= len(rows)
+        if not rows:
+            return
+
+        table_name, subreddit, date = key
+        directory = os.path.join(
+            self.root_dir, table_name, f"subreddit={subreddit}", f"date={date}"
+        )
+        try:
+            table = pa.Table.from_pylist(rows, schema=SCHEMAS[table_name])
+            self._write_file(directory, table_name, table)
+            self._written[directory] = table_name
+        except Exception as e:
+            print(f"Error writing {len(rows)} rows to {directory}: {e}")
+
+    def _write_file(self, directory: str, table_name: str, table: pa.Table) -> None:
+        """Write a table to a new part file in bounded row groups"""
+        name = f"part-{uuid.uuid4().hex}.parquet"
+        temp_path = os.path.join(directory, f".{name}.tmp")
+        try:
+            os.makedirs(directory, exist_ok=True)
+            with pq.ParquetWriter(temp_path, SCHEMAS[table_name]) as writer:
+                writer.write_table(table, row_group_size=self.row_group_size)
+            # Readers only ever see complete files
+            os.replace(temp_path, os.path.join(directory, name))
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def _compact(self, all_partitions: bool = False) -> int:
+        """Merge the part files of each partition, returning how many were merged"""
+        if all_partitions:
+            partitions = {}
+            for table_name in SCHEMAS:
+                for directory, _, names in os.walk(
+                    os.path.join(self.root_dir, table_name)
+                ):
+                    if any(name.startswith("part-") for name in names):
+                        partitions[directory] = table_name
+        else:
+            partitions = dict(self._written)
+
+        compacted = 0
+        for directory, table_name in sorted(partitions.items()):
+            try:
+                compacted += self._compact_partition(directory, table_name)
+            except Exception as e:
+                # Log error but keep the uncompacted parts
+                print(f"Error compacting {directory}: {e}")
+        self._written.clear()
+        return compacted
+
+    def _compact_partition(self, directory: str, table_name: str) -> bool:
+        """Replace a partition's part files with one file"""
+        paths = [
+            os.path.join(directory, name)
+            for name in sorted(os.listdir(directory))
+            if name.startswith("part-") and name.endswith(".parquet")
+        ]
+        if len(paths) < 2:
+            return False
+        table = pa.concat_tables(
+            pq.ParquetFile(path).read().cast(SCHEMAS[table_name]) for path in paths
+        )
+        self._write_file(directory, table_name, table)
+        for path in paths:
+            os.remove(path)
+        return True
+
+
+def backfill(
+    exporter: ParquetExportService,
+    subreddits: List[str],
+    limit: int = 100,
+    listings: Optional[List[str]] = None,
+    min_comments: int = 0,
+    max_workers: int = 8,
+    reddit_service_factory: Optional[Callable[[], Any]] = None,
+) -> Dict[str, int]:
+    """
+    Harvest listings from several subreddits concurrently into the export
+
+    Each subreddit is harvested on its own thread with its own RedditService,
+    since PRAW clients are not safe to share between threads.
+
+    Args:
+        exporter: Export service to append to
+        subreddits: Subreddits to harvest
+        limit: Maximum submissions to read from each listing
+        listings: Listings to read per subreddit (defaults to ["hot"])
+        min_comments: Only harvest submissions with more comments than this
+        max_workers: Subreddits harvested at the same time
+        reddit_service_factory: Creates a RedditService per subreddit
+
+    Returns:
+        Dict mapping each subreddit to the number of submissions exported
+    """
+    if reddit_service_factory is None:
+        from service.reddit_service import RedditService
+
+        reddit_service_factory = RedditService
+    listings = listings or ["hot"]
+
+    def harvest(subreddit: str) -> int:
+        reddit_service = reddit_service_factory()
+        seen = set()
+        for listing in listings:
+            for submission in reddit_service.list_submissions(
+                subreddit, listing=listing, limit=limit, min_comments=min_comments
+            ):
+                if submission.id in seen:
+                    continue
+                seen.add(submission.id)
+                submission_data, comments = reddit_service.get_submission_with_comments(
+                    submission.id
+                )
+                exporter.export_submission(submission_data, comments)
+        return len(seen)
+
+    exported = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(harvest, sub): sub for sub in subreddits}
+        for future in as_completed(futures):
+            subreddit = futures[future]
+            try:
+                exported[subreddit] = future.result()
+            except Exception as e:
+                # Log error but continue with other subreddits
+                print(f"Error harvesting r/{subreddit}: {e}")
+                exported[subreddit] = 0
+    return exported
+
+
+def main() -> None:
+    import dotenv
+
+    dotenv.load_dotenv()
+    parser = argparse.ArgumentParser(
+        description="Backfill the Parquet export from subreddit listings"
+    )
+    parser.add_argument("subreddits", nargs="*", help="Subreddits to harvest")
+    parser.add_argument("--output", default="data/export", help="Export directory")
+    parser.add_argument(
+        "--limit", type=int, default=100, help="Submissions per listing"
+    )
+    parser.add_argument(
+        "--listing",
+        action="append",
+        choices=["hot", "new", "top", "rising"],
+        help="Listing to read (repeatable, defaults to hot)",
+    )
+    parser.add_argument("--min-comments", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Merge the part files of every partition in the export",
+    )
+    args = parser.parse_args()
+    if not args.subreddits and not args.compact:
+        parser.error("give subreddits to backfill and/or --compact")
+
+    if not args.subreddits:
+        with ParquetExportService(root_dir=args.output) as exporter:
+            compacted = exporter.compact(all_partitions=True)
+        print(f"Compacted {compacted} partitions")
+        return
+
+    with ParquetExportService(root_dir=args.output) as exporter:
+        exported = backfill(
+            exporter,
+            args.subreddits,
+            limit=args.limit,
+            listings=args.listing,
+            min_comments=args.min_comments,
+            max_workers=args.workers,
+        )
+        if args.compact:
+            exporter.compact(all_partitions=True)
+    for subreddit, count in sorted(exported.items()):
+        print(f"r/{subreddit}: {count} submissions")
+
+
+if __name__ == "__main__":
+    main()
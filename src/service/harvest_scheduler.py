@@ -0,0 +1,325 @@
+import random
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from model.models import RedditSubmission, SubredditConfig, SubredditYield
+from service.reddit_service import RedditService
+
+
+class HarvestScheduler:
+    """
+    Polls subreddits in the background and favors the ones that pay off
+
+    Every fetch updates the subreddit's yield: qualifying posts per fetch,
+    average comment count and the share of fetches that found nothing. The
+    recent yield sets both how often a subreddit is polled and how likely it
+    is to be picked when a post is requested. Qualifying posts found in the
+    background are pooled so requests can be served without a listing call.
+    """
+
+    def __init__(
+        self,
+        subreddits: List[SubredditConfig],
+        reddit_service: Optional[RedditService] = None,
+        base_interval: float = 300.0,
+        min_interval: float = 60.0,
+        max_interval: float = 3600.0,
+        smoothing: float = 0.3,
+        min_weight: float = 0.05,
+        max_pool_size: int = 50,
+        max_candidate_age: float = 1800.0,
+    ):
+        """
+        Initialize harvest scheduler
+
+        Args:
+            subreddits: Subreddits to harvest
+            reddit_service: Reddit service to fetch with (creates one if None)
+            base_interval: Seconds between fetches for a subreddit of average yield
+            min_interval: Shortest allowed seconds between fetches
+            max_interval: Longest allowed seconds between fetches
+            smoothing: Weight of the newest fetch in the recent yield (0-1)
+            min_weight: Selection weight floor so low-yield subreddits are retried
+            max_pool_size: Qualifying posts kept per subreddit
+            max_candidate_age: Seconds before a pooled post is considered stale
+        """
+        self.configs = {config.name: config for config in subreddits}
+        self.reddit_service = reddit_service or RedditService()
+        self.base_interval = base_interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.smoothing = smoothing
+        self.min_weight = min_weight
+        self.max_candidate_age = max_candidate_age
+
+        self.yields = {name: SubredditYield() for name in self.configs}
+        self._pools = {name: deque(maxlen=max_pool_size) for name in self.configs}
+        self._served_ids: deque = deque(maxlen=max_pool_size * len(self.configs) * 4)
+        self._next_due = {name: 0.0 for name in self.configs}
+        self._lock = threading.Lock()
+        # PRAW clients are not thread safe, so fetches are serialized
+        self._reddit_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _active_names(self) -> List[str]:
+        return [name for name, config in self.configs.items() if config.active]
+
+    def selection_weights(self) -> Dict[str, float]:
+        """
+        Selection weight of each active subreddit
+
+        Subreddits are weighted by their recent qualifying posts per fetch,
+        discounted by how often fetches come back empty and scaled by their
+        average comment count relative to the mean across subreddits.
+        Unexplored subreddits get the best observed weight so they are tried
+        early.
+
+        Returns:
+            Dict mapping subreddit name to weight
+        """
+        with self._lock:
+            avg_comments = {
+                name: stats.avg_comments
+                for name, stats in self.yields.items()
+                if stats.avg_comments > 0
+            }
+            mean_comments = (
+                sum(avg_comments.values()) / len(avg_comments) if avg_comments else 0
+            )
+            observed = {}
+            for name, stats in self.yields.items():
+                if stats.recent_yield is None:
+                    continue
+                weight = stats.recent_yield * (1 - stats.recent_failure_rate / 2)
+                if name in avg_comments:
+                    weight *= avg_comments[name] / mean_comments
+                observed[name] = weight
+            optimistic = max(list(observed.values()) + [1.0])
+            return {
+                name: max(self.min_weight, observed.get(name, optimistic))
+                for name in self._active_names()
+            }
+
+    def poll_interval(self, name: str) -> float:
+        """
+        Seconds to wait before fetching a subreddit again
+
+        Subreddits with above-average weight are polled more often than
+        base_interval, below-average ones less often.
+
+        Args:
+            name: Subreddit name
+
+        Returns:
+            float: Interval clamped to [min_interval, max_interval]
+        """
+        weights = self.selection_weights()
+        if name not in weights:
+            return self.max_interval
+        mean_weight = sum(weights.values()) / len(weights)
+        interval = self.base_interval * mean_weight / weights[name]
+        return min(self.max_interval, max(self.min_interval, interval))
+
+    def select_subreddit(self) -> str:
+        """
+        Pick a subreddit at random in proportion to its selection weight
+
+        Returns:
+            str: Subreddit name
+
+        Raises:
+            Exception: If no subreddit is active
+        """
+        weights = self.selection_weights()
+        if not weights:
+            raise Exception("No active subreddits to harvest")
+        names = list(weights)
+        return random.choices(names, weights=[weights[n] for n in names])[0]
+
+    def record_fetch(self, name: str, qualifying: List[RedditSubmission]) -> None:
+        """
+        Update a subreddit's yield after a fetch
+
+        Args:
+            name: Subreddit name
+            qualifying: Qualifying submissions the fetch returned (empty on failure)
+        """
+        with self._lock:
+            stats = self.yields[name]
+            failed = 0.0 if qualifying else 1.0
+            stats.fetches += 1
+            stats.qualifying_posts += len(qualifying)
+            stats.total_comments += sum(s.comments for s in qualifying)
+            stats.failures += int(failed)
+            if stats.recent_yield is None:
+                stats.recent_yield = float(len(qualifying))
+                stats.recent_failure_rate = failed
+            else:
+                stats.recent_yield += self.smoothing * (
+                    len(qualifying) - stats.recent_yield
+                )
+                stats.recent_failure_rate += self.smoothing * (
+                    failed - stats.recent_failure_rate
+                )
+            self.configs[name].last_scraped = datetime.utcnow()
+
+    def harvest_once(
+        self, name: str, reddit_service: Optional[RedditService] = None
+    ) -> List[RedditSubmission]:
+        """
+        Fetch a subreddit listing, record its yield and pool qualifying posts
+
+        Args:
+            name: Subreddit name
+            reddit_service: Reddit service to fetch with instead of the
+                scheduler's own, so the fetch does not wait on background polling
+
+        Returns:
+            List[RedditSubmission]: Qualifying submissions from this fetch
+        """
+        config = self.configs[name]
+        try:
+            if reddit_service is not None:
+                submissions = reddit_service.list_submissions(
+                    name, limit=config.max_posts, min_comments=config.min_comments
+                )
+            else:
+                with self._reddit_lock:
+                    submissions = self.reddit_service.list_submissions(
+                        name, limit=config.max_posts, min_comments=config.min_comments
+                    )
+        except Exception as e:
+            print(f"Error harvesting r/{name}: {e}")
+            submissions = []
+
+        qualifying = [s for s in submissions if s.score >= config.min_upvotes]
+        self.record_fetch(name, qualifying)
+
+        now = time.monotonic()
+        with self._lock:
+            pool = self._pools[name]
+            pooled_ids = {submission.id for _, submission in pool}
+            for submission in qualifying:
+                if (
+                    submission.id not in pooled_ids
+                    and submission.id not in self._served_ids
+                ):
+                    pool.append((now, submission))
+        self._next_due[name] = now + self.poll_interval(name)
+        return qualifying
+
+    def _pop_candidate(
+        self, name: str, min_comments: int
+    ) -> Optional[RedditSubmission]:
+        """
+        Take the most discussed fresh pooled post of a subreddit, if any
+
+        Stale and already served posts are dropped from the pool. Posts below
+        min_comments stay pooled for callers with a lower threshold.
+        """
+        cutoff = time.monotonic() - self.max_candidate_age
+        with self._lock:
+            pool = self._pools[name]
+            kept = [
+                (fetched_at, submission)
+                for fetched_at, submission in pool
+                if fetched_at >= cutoff and submission.id not in self._served_ids
+            ]
+            pool.clear()
+            pool.extend(kept)
+            candidates = [item for item in kept if item[1].comments > min_comments]
+            if not candidates:
+                return None
+            chosen = max(candidates, key=lambda item: item[1].comments)
+            pool.remove(chosen)
+            self._served_ids.append(chosen[1].id)
+            return chosen[1]
+
+    def next_submission(
+        self, min_comments: int = 10, reddit_service: Optional[RedditService] = None
+    ) -> RedditSubmission:
+        """
+        Pick a qualifying submission, preferring high-yield subreddits
+
+        Serves from the background pool when possible and otherwise fetches
+        the chosen subreddit on demand.
+
+        Args:
+            min_comments: Minimum number of comments required
+            reddit_service: Reddit service for the on-demand fetch (uses the
+                scheduler's own, shared with background polling, if None)
+
+        Returns:
+            RedditSubmission: A submission meeting the criteria
+
+        Raises:
+            Exception: If no submissions found matching criteria
+        """
+        name = self.select_subreddit()
+        submission = self._pop_candidate(name, min_comments)
+        if submission is not None:
+            return submission
+
+        self.harvest_once(name, reddit_service)
+        submission = self._pop_candidate(name, min_comments)
+        if submission is None:
+            raise Exception(f"No submissions found in {name} matching filter")
+        return submission
+
+    def schedule_scraping(self) -> None:
+        """Poll due subreddits until stop() is called"""
+        while not self._stop.is_set():
+            active = self._active_names()
+            if not active:
+                self._stop.wait(self.max_interval)
+                continue
+            name = min(active, key=lambda n: self._next_due[n])
+            delay = self._next_due[name] - time.monotonic()
+            if delay > 0:
+                self._stop.wait(delay)
+                continue
+            self.harvest_once(name)
+
+    def start(self) -> None:
+        """Start polling on a daemon thread (no-op if already running)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self.schedule_scraping, name="harvest-scheduler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop the polling thread"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def report(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Summarize yield, weight and polling interval per subreddit
+
+        Returns:
+            Dict mapping subreddit name to its statistics
+        """
+        weights = self.selection_weights()
+        report = {}
+        for name, config in self.configs.items():
+            with self._lock:
+                stats = self.yields[name].model_copy()
+                pooled = len(self._pools[name])
+            report[name] = {
+                **stats.model_dump(),
+                "avg_comments": stats.avg_comments,
+                "active": config.active,
+                "last_scraped": config.last_scraped,
+                "weight": weights.get(name, 0.0),
+                "poll_interval": self.poll_interval(name),
+                "pooled_posts": pooled,
+            }
+        return report
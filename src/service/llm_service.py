@@ -1,16 +1,26 @@
 import os
 import yaml
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from langchain_google_genai import ChatGoogleGenerativeAI
-from model.models import PostSummary, LLMRequest, LLMResponse
+from model.models import (
+    PostSummary,
+    LLMRequest,
+    LLMResponse,
+    ModelRoutingRule,
+    RoutingDecision,
+)
+from service.model_router import ModelRouter, load_routing_rules
 
 
 class LLMService:
     """Service for generating content using Large Language Models"""
 
     def __init__(
-        self, default_model: str = "gemini-2.5-pro", default_temperature: float = 0.7
+        self,
+        default_model: str = "gemini-2.5-pro",
+        default_temperature: float = 0.7,
+        routing_rules: Optional[List[ModelRoutingRule]] = None,
     ):
         """
         Initialize LLM service
@@ -18,9 +28,15 @@ class LLMService:
         Args:
             default_model: Default model to use for generation
             default_temperature: Default temperature for generation
+            routing_rules: Rules routing small contexts to cheaper models
+                (read from ROUTING_RULES_FILE if set, otherwise the router
+                defaults, if None; pass [] to disable routing)
         """
         self.default_model = default_model
         self.default_temperature = default_temperature
+        if routing_rules is None and os.getenv("ROUTING_RULES_FILE"):
+            routing_rules = load_routing_rules(os.getenv("ROUTING_RULES_FILE"))
+        self.router = ModelRouter(default_model=default_model, rules=routing_rules)
         self._validate_api_key()
 
     def _validate_api_key(self) -> None:
@@ -47,7 +63,8 @@ class LLMService:
             model=model, google_api_key=api_key, temperature=temperature
         )
 
-    def post_summary_to_yaml(self, post_summary: PostSummary) -> str:
+    @staticmethod
+    def post_summary_to_yaml(post_summary: PostSummary) -> str:
         """
         Convert PostSummary to YAML string
 
@@ -63,6 +80,29 @@ class LLMService:
             summary_dict, default_flow_style=False, sort_keys=False, allow_unicode=True
         )
 
+    def route_model(
+        self,
+        post_summary: PostSummary,
+        yaml_content: str,
+        model: Optional[str] = None,
+    ) -> RoutingDecision:
+        """
+        Select the model for a post summary from its context size and comment count
+
+        Args:
+            post_summary: The structured post summary
+            yaml_content: The serialized context that will be sent
+            model: Model explicitly requested by the caller (bypasses routing)
+
+        Returns:
+            RoutingDecision: The selected model and why it was selected
+        """
+        return self.router.route(
+            context_chars=len(yaml_content),
+            comment_count=post_summary.count_comments(),
+            requested_model=model,
+        )
+
     def generate_linkedin_post(
         self,
         post_summary: PostSummary,
@@ -76,14 +116,13 @@ class LLMService:
         Args:
             post_summary: The structured post summary
             custom_prompt: Custom prompt (uses default if None)
-            model: Model to use (uses default if None)
+            model: Model to use (routed from the context size if None)
             temperature: Temperature to use (uses default if None)
 
         Returns:
             LLMResponse: Generated content and metadata
         """
         # Use defaults if not specified
-        model = model or self.default_model
         temperature = temperature or self.default_temperature
 
         # Default prompt for LinkedIn post generation
@@ -97,15 +136,20 @@ class LLMService:
         # Convert post summary to YAML
         yaml_content = self.post_summary_to_yaml(post_summary)
 
+        # Pick the model tier for this context
+        routing = self.route_model(post_summary, yaml_content, model=model)
+
         # Create LLM request
         llm_request = LLMRequest(
             prompt=custom_prompt,
             context=yaml_content,
-            model=model,
+            model=routing.model,
             temperature=temperature,
         )
 
-        return self.query_llm(llm_request)
+        llm_response = self.query_llm(llm_request)
+        llm_response.routing = routing
+        return llm_response
 
     def query_llm(self, llm_request: LLMRequest) -> LLMResponse:
         """
@@ -152,7 +196,7 @@ class LLMService:
         Args:
             post_summary: The structured post summary
             prompt: Custom prompt for generation
-            model: Model to use (uses default if None)
+            model: Model to use (routed from the context size if None)
             temperature: Temperature to use (uses default if None)
 
         Returns:
@@ -178,7 +222,7 @@ class LLMService:
         Args:
             post_summaries: List of post summaries to process
             prompt: Prompt to use for all generations
-            model: Model to use (uses default if None)
+            model: Model to use (routed per summary if None)
             temperature: Temperature to use (uses default if None)
 
         Returns:
@@ -0,0 +1,90 @@
+import json
+from typing import List, Optional
+from model.models import ModelRoutingRule, RoutingDecision
+
+
+DEFAULT_ROUTING_RULES = [
+    ModelRoutingRule(
+        model="gemini-2.5-flash-lite", max_context_chars=4000, max_comments=10
+    ),
+    ModelRoutingRule(
+        model="gemini-2.5-flash", max_context_chars=16000, max_comments=40
+    ),
+]
+
+
+def load_routing_rules(path: str) -> List[ModelRoutingRule]:
+    """
+    Load routing rules from a JSON file containing a list of rule objects
+
+    Args:
+        path: Path to the JSON rules file
+
+    Returns:
+        List[ModelRoutingRule]: Rules in evaluation order
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        raw_rules = json.load(f)
+    return [ModelRoutingRule(**rule) for rule in raw_rules]
+
+
+class ModelRouter:
+    """Selects an LLM model from the size of the context being sent"""
+
+    def __init__(
+        self,
+        default_model: str = "gemini-2.5-pro",
+        rules: Optional[List[ModelRoutingRule]] = None,
+    ):
+        """
+        Initialize model router
+
+        Args:
+            default_model: Model used when no rule matches
+            rules: Routing rules evaluated in order (uses defaults if None)
+        """
+        self.default_model = default_model
+        self.rules = list(DEFAULT_ROUTING_RULES if rules is None else rules)
+
+    def route(
+        self,
+        context_chars: int,
+        comment_count: int,
+        requested_model: Optional[str] = None,
+    ) -> RoutingDecision:
+        """
+        Pick the model for a request
+
+        Args:
+            context_chars: Size of the serialized context
+            comment_count: Number of comments in the post summary
+            requested_model: Model explicitly requested by the caller, if any
+
+        Returns:
+            RoutingDecision: The selected model and why it was selected
+        """
+        if requested_model:
+            return RoutingDecision(
+                model=requested_model,
+                reason="explicit",
+                context_chars=context_chars,
+                comment_count=comment_count,
+            )
+
+        # First matching rule wins
+        for index, rule in enumerate(self.rules):
+            if rule.matches(context_chars, comment_count):
+                return RoutingDecision(
+                    model=rule.model,
+                    reason="rule",
+                    rule_index=index,
+                    context_chars=context_chars,
+                    comment_count=comment_count,
+                )
+
+        return RoutingDecision(
+            model=self.default_model,
+            reason="default",
+            context_chars=context_chars,
+            comment_count=comment_count,
+        )
@@ -0,0 +1,238 @@
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime
+from typing import List, Optional, Tuple
+from model.models import HotFunction, ProfileSummary
+
+# A sampled call stack, outermost frame first; each frame is
+# (function, filename, first line)
+Stack = Tuple[Tuple[str, str, int], ...]
+
+
+class StackSampler:
+    """
+    Samples the call stack of a single thread at a fixed interval
+
+    Unlike cProfile, which records every thread in the process on Python
+    3.12+, only the target thread is sampled, so concurrent requests and
+    background threads do not show up in the profile.
+    """
+
+    def __init__(self, thread_id: int, interval: float = 0.005):
+        """
+        Initialize stack sampler
+
+        Args:
+            thread_id: Identifier of the thread to sample (threading.get_ident())
+            interval: Seconds between samples
+        """
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start sampling on a daemon thread"""
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="stack-sampler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling and wait for the sampler thread to exit"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                break
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append((code.co_name, code.co_filename, code.co_firstlineno))
+                frame = frame.f_back
+            self.stacks[tuple(reversed(stack))] += 1
+            self.samples += 1
+
+
+class ProfilingService:
+    """Saves sampled profiles of the generation pipeline with bounded retention"""
+
+    def __init__(
+        self,
+        output_dir: str = "data/profiles",
+        max_profiles: int = 50,
+        max_total_bytes: int = 50 * 1024 * 1024,
+        top_n: int = 15,
+        interval: float = 0.005,
+    ):
+        """
+        Initialize profiling service
+
+        Args:
+            output_dir: Directory to save collapsed stack files to
+            max_profiles: Number of most recent profiles to keep
+            max_total_bytes: Total size of kept profiles before the oldest are deleted
+            top_n: Number of hot functions to include in summaries
+            interval: Seconds between stack samples
+        """
+        self.output_dir = output_dir
+        self.max_profiles = max_profiles
+        self.max_total_bytes = max_total_bytes
+        self.top_n = top_n
+        self.interval = interval
+        self._lock = threading.Lock()
+
+    def summarize(
+        self, sampler: StackSampler, profile_id: str, duration: float
+    ) -> ProfileSummary:
+        """
+        Summarize a finished profile by the functions with the most self time
+
+        Args:
+            sampler: The stopped sampler
+            profile_id: Identifier of the profile
+            duration: Wall-clock seconds profiled
+
+        Returns:
+            ProfileSummary: The top hot functions
+        """
+        self_samples: Counter = Counter()
+        cumulative_samples: Counter = Counter()
+        for stack, count in sampler.stacks.items():
+            self_samples[stack[-1]] += count
+            # Count recursive functions once per stack
+            for frame in set(stack):
+                cumulative_samples[frame] += count
+
+        hot_functions = []
+        for frame, count in self_samples.most_common(self.top_n):
+            funcname, filename, lineno = frame
+            hot_functions.append(
+                HotFunction(
+                    function=funcname,
+                    location=f"{filename}:{lineno}",
+                    samples=count,
+                    total_time=count * sampler.interval,
+                    cumulative_time=cumulative_samples[frame] * sampler.interval,
+                )
+            )
+        return ProfileSummary(
+            profile_id=profile_id,
+            duration_seconds=duration,
+            samples=sampler.samples,
+            interval_seconds=sampler.interval,
+            hot_functions=hot_functions,
+        )
+
+    def save(self, sampler: StackSampler, duration: float) -> ProfileSummary:
+        """
+        Save a finished profile, prune old ones and summarize it
+
+        The profile is saved in the collapsed stack format read by flamegraph.pl
+        and speedscope, one "outer;...;inner count" line per distinct stack.
+
+        Args:
+            sampler: The stopped sampler
+            duration: Wall-clock seconds profiled
+
+        Returns:
+            ProfileSummary: Summary including where the profile was saved
+        """
+        profile_id = (
+            f"{datetime.utcnow().strftime('%Y%m%dT%H%M%S%f')}-{uuid.uuid4().hex[:8]}"
+        )
+        summary = self.summarize(sampler, profile_id, duration)
+
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            path = os.path.join(self.output_dir, f"{profile_id}.folded")
+            with open(path, "w") as f:
+                for stack, count in sampler.stacks.most_common():
+                    frames = ";".join(
+                        f"{funcname} ({os.path.basename(filename)}:{lineno})"
+                        for funcname, filename, lineno in stack
+                    )
+                    f.write(f"{frames} {count}\n")
+            summary.path = path
+            self._prune()
+        except OSError as e:
+            # Still return the summary if the profile cannot be stored
+            print(f"Error saving profile '{profile_id}': {e}")
+
+        return summary
+
+    def list_profiles(self) -> List[str]:
+        """Saved profile paths, oldest first"""
+        if not os.path.isdir(self.output_dir):
+            return []
+        paths = [
+            os.path.join(self.output_dir, name)
+            for name in os.listdir(self.output_dir)
+            if name.endswith(".folded")
+        ]
+        return sorted(paths, key=lambda path: (os.path.getmtime(path), path))
+
+    def _prune(self) -> None:
+        """Delete the oldest profiles beyond the count and size limits"""
+        with self._lock:
+            paths = self.list_profiles()
+            sizes = {path: os.path.getsize(path) for path in paths}
+            total = sum(sizes.values())
+            while paths and (
+                len(paths) > self.max_profiles or total > self.max_total_bytes
+            ):
+                oldest = paths.pop(0)
+                total -= sizes[oldest]
+                os.remove(oldest)
+
+
+class ProfileSession:
+    """
+    Context manager profiling its block when enabled
+
+    Only the thread entering the block is sampled. When disabled, or when no
+    ProfilingService is configured, entering and leaving the block only
+    checks a flag.
+    """
+
+    def __init__(self, service: Optional[ProfilingService], enabled: bool = False):
+        """
+        Initialize profile session
+
+        Args:
+            service: Service to save the profile with (profiling is off if None)
+            enabled: Whether to profile the block
+        """
+        self.service = service
+        self.enabled = enabled and service is not None
+        self.summary: Optional[ProfileSummary] = None
+        self._sampler: Optional[StackSampler] = None
+        self._started = 0.0
+
+    def __enter__(self) -> "ProfileSession":
+        if self.enabled:
+            self._sampler = StackSampler(
+                threading.get_ident(), interval=self.service.interval
+            )
+            self._started = time.perf_counter()
+            self._sampler.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if self._sampler is not None:
+            self._sampler.stop()
+            duration = time.perf_counter() - self._started
+            self.summary = self.service.save(self._sampler, duration)
+            self._sampler = None
@@ -34,13 +34,42 @@ class RedditService:
             Exception: If no submissions found matching criteria
         """
         sub = subreddits[randrange(0, len(subreddits))]
-        submissions_list = []
+        submissions_list = self.list_submissions(
+            sub, limit=limit, min_comments=min_comments
+        )
+
+        if len(submissions_list) > 0:
+            return submissions_list[randrange(0, len(submissions_list))]
+        else:
+            raise Exception(f"No submissions found in {sub} matching filter")
+
+    def list_submissions(
+        self,
+        subreddit: str,
+        listing: str = "hot",
+        limit: int = 10,
+        min_comments: int = 0,
+    ) -> List[RedditSubmission]:
+        """
+        List submissions from a subreddit listing above a comment threshold
 
-        for submission in self.reddit.subreddit(sub).hot(limit=limit):
+        Args:
+            subreddit: Subreddit name
+            listing: Listing to read ("hot", "new", "top" or "rising")
+            limit: Maximum number of submissions to fetch
+            min_comments: Only keep submissions with more comments than this
+
+        Returns:
+            List[RedditSubmission]: Matching submissions in listing order
+        """
+        submissions_list = []
+        for submission in getattr(self.reddit.subreddit(subreddit), listing)(
+            limit=limit
+        ):
             if submission.num_comments > min_comments:
                 submissions_list.append(
                     RedditSubmission(
-                        subreddit=sub,
+                        subreddit=subreddit,
                         title=submission.title,
                         score=submission.score,
                         id=submission.id,
@@ -48,11 +77,7 @@ class RedditService:
                         body=submission.selftext,
                     )
                 )
-
-        if len(submissions_list) > 0:
-            return submissions_list[randrange(0, len(submissions_list))]
-        else:
-            raise Exception(f"No submissions found in {sub} matching filter")
+        return submissions_list
 
     def extract_comment_recursively(self, comment) -> Optional[RedditComment]:
         """
@@ -0,0 +1,251 @@
+import gzip
+import json
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+RESULT_FIELDS = ("submission", "comments", "post_summary", "llm_response", "metadata")
+COMPACT_FIELDS = ("submission", "llm_response", "metadata")
+MIN_COMPRESS_BYTES = 1024
+
+
+def parse_fields(fields: Optional[str], compact: bool = False) -> Optional[List[str]]:
+    """
+    Parse a comma-separated fields selector
+
+    Args:
+        fields: Selector such as "llm_response,metadata" (None selects all)
+        compact: Whether only the compact fields may be selected
+
+    Returns:
+        List of field names, or None to keep every field
+
+    Raises:
+        ValueError: If a field is not part of the (compact) result
+    """
+    if not fields:
+        return None
+    available = COMPACT_FIELDS if compact else RESULT_FIELDS
+    selected = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = [field for field in selected if field not in available]
+    if unknown:
+        mode = "compact " if compact else ""
+        raise ValueError(
+            f"Unknown {mode}fields: {', '.join(unknown)}. "
+            f"Available: {', '.join(available)}"
+        )
+    return selected
+
+
+def select_fields(
+    result: Dict[str, Any], compact: bool = False, fields: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """
+    Reduce a PostController result to the requested fields
+
+    Compact mode drops the comment list, the post summary and the submission
+    body, which repeat the thread text the generated post was built from.
+
+    Args:
+        result: Dict returned by PostController.get_random_post_with_llm_response
+        compact: Whether to return the compact representation
+        fields: Top-level fields to keep (limited to the compact fields in
+            compact mode)
+
+    Returns:
+        Dict with the selected fields
+    """
+    available = COMPACT_FIELDS if compact else RESULT_FIELDS
+    keys = [key for key in fields if key in available] if fields else available
+    payload = {key: result[key] for key in keys if key in result}
+    if compact and isinstance(payload.get("submission"), BaseModel):
+        payload["submission"] = payload["submission"].model_dump(exclude={"body"})
+    return payload
+
+
+def _default(obj: Any) -> Any:
+    """Serialize values the JSON encoders do not handle natively"""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def encode_json(payload: Any) -> bytes:
+    """
+    Serialize a payload to JSON bytes, using orjson when available
+
+    Args:
+        payload: Dicts, lists and pydantic models to serialize
+
+    Returns:
+        bytes: UTF-8 encoded JSON
+    """
+    if orjson is not None:
+        return orjson.dumps(payload, default=_default)
+    return json.dumps(payload, default=_default, separators=(",", ":")).encode()
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    Pick the best supported content coding from an Accept-Encoding header
+
+    Args:
+        accept_encoding: The request's Accept-Encoding header value
+
+    Returns:
+        "br", "gzip" or None for an uncompressed response
+    """
+    accepted = {}
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        if coding:
+            accepted[coding] = quality
+
+    supported = ["br", "gzip"] if brotli is not None else ["gzip"]
+    qualities = {
+        coding: accepted.get(coding, accepted.get("*", 0.0)) for coding in supported
+    }
+    candidates = [coding for coding in supported if qualities[coding] > 0]
+    if not candidates:
+        return None
+    # Highest quality wins, ties go to the order in supported
+    return max(candidates, key=qualities.get)
+
+
+def compress(body: bytes, encoding: Optional[str]) -> bytes:
+    """
+    Compress a response body with the negotiated content coding
+
+    Args:
+        body: Uncompressed body
+        encoding: "br", "gzip" or None
+
+    Returns:
+        bytes: The encoded body
+    """
+    if encoding == "br":
+        return brotli.compress(body, quality=5)
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=6)
+    return body
+
+
+class ResponseMetrics:
+    """Running totals of response sizes and encoding time (thread safe)"""
+
+    def __init__(self):
+        """Initialize empty metrics"""
+        self._lock = threading.Lock()
+        self.responses = 0
+        self.raw_bytes = 0
+        self.sent_bytes = 0
+        self.serialize_seconds = 0.0
+        self.max_serialize_seconds = 0.0
+        self.compress_seconds = 0.0
+        self.by_encoding: Dict[str, int] = {}
+
+    def record(
+        self,
+        raw_bytes: int,
+        sent_bytes: int,
+        serialize_seconds: float,
+        compress_seconds: float,
+        encoding: Optional[str],
+    ) -> None:
+        """Record one encoded response"""
+        key = encoding or "identity"
+        with self._lock:
+            self.responses += 1
+            self.raw_bytes += raw_bytes
+            self.sent_bytes += sent_bytes
+            self.serialize_seconds += serialize_seconds
+            self.max_serialize_seconds = max(
+                self.max_serialize_seconds, serialize_seconds
+            )
+            self.compress_seconds += compress_seconds
+            self.by_encoding[key] = self.by_encoding.get(key, 0) + 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the current totals and averages"""
+        with self._lock:
+            count = self.responses or 1
+            return {
+                "responses": self.responses,
+                "raw_bytes_total": self.raw_bytes,
+                "sent_bytes_total": self.sent_bytes,
+                "avg_raw_bytes": self.raw_bytes / count,
+                "avg_sent_bytes": self.sent_bytes / count,
+                "compression_ratio": (
+                    self.sent_bytes / self.raw_bytes if self.raw_bytes else 1.0
+                ),
+                "avg_serialize_ms": self.serialize_seconds / count * 1000,
+                "max_serialize_ms": self.max_serialize_seconds * 1000,
+                "avg_compress_ms": self.compress_seconds / count * 1000,
+                "responses_by_encoding": dict(self.by_encoding),
+            }
+
+
+def encode_response(
+    payload: Any,
+    accept_encoding: str = "",
+    metrics: Optional[ResponseMetrics] = None,
+) -> Tuple[bytes, Dict[str, str]]:
+    """
+    Serialize and compress a payload for an HTTP response
+
+    Args:
+        payload: The response payload
+        accept_encoding: The request's Accept-Encoding header value
+        metrics: Metrics to record the response in
+
+    Returns:
+        Tuple of (body, headers) where headers carry Content-Encoding, Vary and
+        the serialization measurements
+    """
+    started = time.perf_counter()
+    raw = encode_json(payload)
+    serialized = time.perf_counter()
+
+    encoding = negotiate_encoding(accept_encoding)
+    if len(raw) < MIN_COMPRESS_BYTES:
+        encoding = None
+    body = compress(raw, encoding)
+    compressed = time.perf_counter()
+
+    headers = {
+        "Vary": "Accept-Encoding",
+        "X-Uncompressed-Bytes": str(len(raw)),
+        "X-Serialization-Ms": f"{(serialized - started) * 1000:.2f}",
+    }
+    if encoding:
+        headers["Content-Encoding"] = encoding
+
+    if metrics is not None:
+        metrics.record(
+            raw_bytes=len(raw),
+            sent_bytes=len(body),
+            serialize_seconds=serialized - started,
+            compress_seconds=compressed - serialized,
+            encoding=encoding,
+        )
+    return body, headers
@@ -0,0 +1,119 @@
+import argparse
+import json
+from typing import Dict, Iterator, List, Optional
+from model.models import ModelRoutingRule, PostSummary
+from service.llm_service import LLMService
+from service.model_router import ModelRouter, load_routing_rules
+
+
+def load_workload(path: str) -> Iterator[PostSummary]:
+    """
+    Read a recorded workload of post summaries from a JSON Lines file
+
+    Each line is either a serialized PostSummary or a recorded
+    /generate-post result containing a "post_summary" key.
+
+    Args:
+        path: Path to the JSON Lines workload file
+
+    Yields:
+        PostSummary: Each recorded post summary
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            yield PostSummary(**record.get("post_summary", record))
+
+
+def build_routing_report(
+    post_summaries: Iterator[PostSummary],
+    default_model: str = "gemini-2.5-pro",
+    rules: Optional[List[ModelRoutingRule]] = None,
+) -> Dict[str, Dict[str, float]]:
+    """
+    Simulate routing a workload and summarize how it splits across models
+
+    Args:
+        post_summaries: The recorded post summaries to route
+        default_model: Model used when no rule matches
+        rules: Routing rules to evaluate (uses the router defaults if None)
+
+    Returns:
+        Dict mapping each model to its request count, share and context sizes
+    """
+    router = ModelRouter(default_model=default_model, rules=rules)
+    report: Dict[str, Dict[str, float]] = {}
+    total = 0
+
+    for post_summary in post_summaries:
+        yaml_content = LLMService.post_summary_to_yaml(post_summary)
+        decision = router.route(
+            context_chars=len(yaml_content),
+            comment_count=post_summary.count_comments(),
+        )
+        tier = report.setdefault(
+            decision.model,
+            {"requests": 0, "context_chars": 0, "max_context_chars": 0},
+        )
+        tier["requests"] += 1
+        tier["context_chars"] += decision.context_chars
+        tier["max_context_chars"] = max(
+            tier["max_context_chars"], decision.context_chars
+        )
+        total += 1
+
+    for tier in report.values():
+        tier["share"] = tier["requests"] / total
+        tier["avg_context_chars"] = tier["context_chars"] / tier["requests"]
+
+    return report
+
+
+def format_routing_report(report: Dict[str, Dict[str, float]]) -> str:
+    """
+    Format a routing report as a plain-text table
+
+    Args:
+        report: Report produced by build_routing_report
+
+    Returns:
+        str: Table with one row per model
+    """
+    header = (
+        f"{'model':<28}{'requests':>10}{'share':>9}{'avg chars':>12}{'max chars':>12}"
+    )
+    lines = [header, "-" * len(header)]
+    for model, tier in sorted(report.items(), key=lambda item: -item[1]["requests"]):
+        lines.append(
+            f"{model:<28}{tier['requests']:>10}{tier['share']:>9.1%}"
+            f"{tier['avg_context_chars']:>12.0f}{tier['max_context_chars']:>12}"
+        )
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Report how a recorded workload would split across model tiers"
+    )
+    parser.add_argument("workload", help="JSON Lines file of recorded post summaries")
+    parser.add_argument("--rules", help="JSON file of routing rules")
+    parser.add_argument(
+        "--default-model", default="gemini-2.5-pro", help="Fallback model"
+    )
+    args = parser.parse_args()
+
+    rules = load_routing_rules(args.rules) if args.rules else None
+    report = build_routing_report(
+        load_workload(args.workload), default_model=args.default_model, rules=rules
+    )
+    if not report:
+        print("Workload is empty")
+        return
+    print(format_routing_report(report))
+
+
+if __name__ == "__main__":
+    main()
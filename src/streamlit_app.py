@@ -2,6 +2,7 @@ import streamlit as st
 import os
 import dotenv
 from controller.post_controller import PostController
+from service.profiling_service import ProfilingService
 
 # Load environment variables from .env file
 dotenv.load_dotenv()
@@ -15,7 +16,8 @@ st.set_page_config(
 # Initialize controller
 @st.cache_resource
 def get_controller():
-    return PostController()
+    profiler = ProfilingService(output_dir=os.getenv("PROFILE_DIR", "data/profiles"))
+    return PostController(profiler=profiler)
 
 
 def main():
@@ -36,22 +38,27 @@ def main():
         st.info("Please set these in your .env file")
         return
 
+    # Sidebar options
+    profile = st.sidebar.toggle(
+        "⏱️ Profile generation", help="Profile the pipeline and show hot functions"
+    )
+
     # Main generate button
     col1, col2, col3 = st.columns([1, 2, 1])
     with col2:
         if st.button(
             "🎲 Generate Random Post", type="primary", use_container_width=True
         ):
-            generate_post()
+            generate_post(profile=profile)
 
 
-def generate_post():
+def generate_post(profile: bool = False):
     """Generate and display a random post with LLM response"""
     controller = get_controller()
 
     with st.spinner("🔍 Finding a random Reddit post..."):
         try:
-            result = controller.get_random_post_with_llm_response()
+            result = controller.get_random_post_with_llm_response(profile=profile)
             display_results(result)
         except Exception as e:
             st.error(f"❌ Error generating post: {str(e)}")
@@ -135,6 +142,20 @@ def display_results(result):
         else:
             st.info("No comments found")
 
+    # Profile
+    profile_summary = metadata.get("profile")
+    if profile_summary:
+        with st.expander(
+            f"⏱️ Profile ({profile_summary.duration_seconds:.2f}s, "
+            f"{profile_summary.samples} samples)",
+            expanded=False,
+        ):
+            st.caption(f"Saved to {profile_summary.path or 'memory only'}")
+            st.dataframe(
+                [hot.model_dump() for hot in profile_summary.hot_functions],
+                use_container_width=True,
+            )
+
     # Raw Data (for debugging)
     with st.expander("🔧 Raw Data (Debug)", expanded=False):
         st.json(
@@ -0,0 +1,122 @@
+import time
+from datetime import datetime
+import pandas as pd
+import pyarrow.parquet as pq
+from model.models import LLMResponse, RedditComment, RedditSubmission
+from service.export_service import ParquetExportService, backfill, flatten_comments
+from loadtest.stubs import StubConfig, StubRedditService
+
+SUBMISSION = RedditSubmission(
+    subreddit="aws", title="title", score=1, id="s1", comments=4, body=None
+)
+COMMENTS = [
+    RedditComment(id="a", author="u1", body="a", score=3, children=["b", "missing"]),
+    RedditComment(id="b", author="u2", body="b", score=2, children=["c"]),
+    RedditComment(id="c", author="u3", body="c", score=1),
+    RedditComment(id="d", author="u4", body="d", score=0),
+]
+
+
+def test_flatten_comments_parent_and_depth():
+    flattened = [
+        (comment.id, parent_id, depth)
+        for comment, parent_id, depth in flatten_comments("s1", COMMENTS)
+    ]
+
+    assert flattened == [
+        ("a", "s1", 0),
+        ("b", "a", 1),
+        ("c", "b", 2),
+        ("d", "s1", 0),
+    ]
+
+
+def test_flush_writes_readable_partitioned_files(tmp_path):
+    exporter = ParquetExportService(str(tmp_path), row_group_size=2)
+    try:
+        exporter.export_submission(
+            SUBMISSION, COMMENTS, harvested_at=datetime(2025, 1, 2, 3, 4)
+        )
+        exporter.export_generation(
+            SUBMISSION,
+            LLMResponse(content="post", model_used="m", timestamp=datetime(2025, 1, 2)),
+        )
+        exporter.flush()
+
+        # Readable without closing the exporter
+        comments = pd.read_parquet(tmp_path / "comments")
+        generations = pd.read_parquet(tmp_path / "generations")
+    finally:
+        exporter.close()
+
+    assert sorted(comments["id"]) == ["a", "b", "c", "d"]
+    assert set(comments["subreddit"].astype(str)) == {"aws"}
+    assert set(comments["date"].astype(str)) == {"2025-01-02"}
+    assert comments.set_index("id").loc["c", "parent_id"] == "b"
+    assert list(generations["content"]) == ["post"]
+    assert not list(tmp_path.rglob(".*.tmp"))
+
+
+def test_rows_are_flushed_once_they_age_out(tmp_path):
+    exporter = ParquetExportService(str(tmp_path), flush_interval=0.1)
+    try:
+        exporter.export_submission(SUBMISSION, COMMENTS)
+        deadline = time.monotonic() + 5
+        while not list(tmp_path.glob("submissions/*/*/part-*.parquet")):
+            assert time.monotonic() < deadline, "buffer was never flushed"
+            time.sleep(0.05)
+    finally:
+        exporter.close()
+
+    assert len(pd.read_parquet(tmp_path / "submissions")) == 1
+
+
+def test_backfill_exports_every_subreddit(tmp_path):
+    config = StubConfig(
+        reddit_listing_latency=0, reddit_submission_latency=0, listing_size=3
+    )
+
+    with ParquetExportService(str(tmp_path)) as exporter:
+        exported = backfill(
+            exporter,
+            ["one", "two"],
+            limit=3,
+            reddit_service_factory=lambda: StubRedditService(config),
+        )
+
+    assert exported == {"one": 3, "two": 3}
+    assert len(pd.read_parquet(tmp_path / "submissions")) == 6
+
+
+def test_compact_merges_part_files_into_bounded_row_groups(tmp_path):
+    exporter = ParquetExportService(
+        str(tmp_path), row_group_size=3, compact_on_close=False
+    )
+    try:
+        for index in range(4):
+            submission = SUBMISSION.model_copy(update={"id": f"s{index}"})
+            exporter.export_submission(submission, COMMENTS[:2])
+            exporter.flush()
+        partition = next((tmp_path / "comments").glob("*/*"))
+        assert len(list(partition.glob("part-*.parquet"))) == 4
+
+        assert exporter.compact() == 2
+    finally:
+        exporter.close()
+
+    parts = list(partition.glob("part-*.parquet"))
+    assert len(parts) == 1
+    metadata = pq.ParquetFile(parts[0]).metadata
+    assert metadata.num_rows == 8
+    assert metadata.num_row_groups == 3
+    assert len(pd.read_parquet(tmp_path / "submissions")) == 4
+
+
+def test_close_compacts_written_partitions(tmp_path):
+    with ParquetExportService(str(tmp_path)) as exporter:
+        exporter.export_submission(SUBMISSION, COMMENTS)
+        exporter.flush()
+        exporter.export_submission(SUBMISSION, COMMENTS)
+
+    assert len(list(tmp_path.glob("comments/*/*/part-*.parquet"))) == 1
+    assert len(pd.read_parquet(tmp_path / "comments")) == 8
@@ -0,0 +1,108 @@
+import time
+import pytest
+from model.models import RedditSubmission, SubredditConfig
+from service.harvest_scheduler import HarvestScheduler
+
+
+def submission(id: str, comments: int, subreddit: str = "one") -> RedditSubmission:
+    return RedditSubmission(
+        subreddit=subreddit, title=id, score=10, id=id, comments=comments
+    )
+
+
+class FakeRedditService:
+    def __init__(self, listings=None):
+        self.listings = listings or {}
+        self.calls = []
+
+    def list_submissions(self, subreddit, limit=10, min_comments=0):
+        self.calls.append(subreddit)
+        listing = self.listings.get(subreddit, [])
+        return [s for s in listing if s.comments > min_comments]
+
+
+def make_scheduler(names=("one", "two"), reddit_service=None, **kwargs):
+    return HarvestScheduler(
+        [SubredditConfig(name=name, min_comments=0) for name in names],
+        reddit_service=reddit_service or FakeRedditService(),
+        **kwargs,
+    )
+
+
+def test_unexplored_subreddits_get_the_best_weight():
+    scheduler = make_scheduler()
+    scheduler.record_fetch("one", [submission("a", 10), submission("b", 10)])
+
+    assert scheduler.selection_weights() == {"one": 2.0, "two": 2.0}
+
+
+def test_weights_favor_yield_and_discount_failures():
+    scheduler = make_scheduler(min_weight=0.01)
+    scheduler.record_fetch("one", [submission("a", 10), submission("b", 10)])
+    scheduler.record_fetch("two", [submission("c", 10)])
+    scheduler.record_fetch("two", [])
+
+    weights = scheduler.selection_weights()
+
+    assert weights["one"] == pytest.approx(2.0)
+    # recent_yield 0.7, recent_failure_rate 0.3
+    assert weights["two"] == pytest.approx(0.7 * 0.85)
+
+
+def test_weights_scale_with_average_comments():
+    scheduler = make_scheduler()
+    scheduler.record_fetch("one", [submission("a", 30)])
+    scheduler.record_fetch("two", [submission("b", 10)])
+
+    weights = scheduler.selection_weights()
+
+    # Mean average comment count is 20
+    assert weights["one"] == pytest.approx(1.5)
+    assert weights["two"] == pytest.approx(0.5)
+
+
+def test_poll_interval_follows_weight():
+    scheduler = make_scheduler(base_interval=100, min_interval=1, max_interval=1000)
+    scheduler.record_fetch("one", [submission("a", 10)] * 3)
+    scheduler.record_fetch("two", [submission("b", 10)])
+
+    assert scheduler.poll_interval("one") < 100 < scheduler.poll_interval("two")
+
+
+def test_pool_keeps_posts_below_the_callers_threshold():
+    listings = {"one": [submission("small", 5), submission("big", 50)]}
+    scheduler = make_scheduler(("one",), FakeRedditService(listings))
+    scheduler.harvest_once("one")
+
+    assert scheduler.next_submission(min_comments=20).id == "big"
+    assert scheduler.next_submission(min_comments=1).id == "small"
+
+
+def test_pool_drops_stale_and_served_posts():
+    listings = {"one": [submission("a", 50)]}
+    reddit_service = FakeRedditService(listings)
+    scheduler = make_scheduler(("one",), reddit_service, max_candidate_age=60)
+    scheduler.harvest_once("one")
+    scheduler._pools["one"].appendleft((time.monotonic() - 120, submission("old", 99)))
+
+    assert scheduler.next_submission(min_comments=1).id == "a"
+    assert not scheduler._pools["one"]
+
+    # A new listing returning the served post does not serve it again
+    scheduler.harvest_once("one")
+    with pytest.raises(Exception, match="No submissions found in one"):
+        scheduler.next_submission(min_comments=1)
+
+
+def test_on_demand_fetch_uses_the_callers_service():
+    background = FakeRedditService()
+    caller = FakeRedditService({"one": [submission("a", 50)]})
+    scheduler = make_scheduler(("one",), background)
+
+    with scheduler._reddit_lock:
+        # Background polling holds the lock; the request must not wait on it
+        picked = scheduler.next_submission(min_comments=1, reddit_service=caller)
+
+    assert picked.id == "a"
+    assert caller.calls == ["one"]
+    assert background.calls == []
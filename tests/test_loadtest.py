@@ -0,0 +1,77 @@
+import pytest
+from fastapi.testclient import TestClient
+from loadtest.metrics import percentile, summarize
+from loadtest.stubs import StubConfig, create_stub_app, create_stub_controller
+
+FAST_STUBS = StubConfig(
+    reddit_listing_latency=0,
+    reddit_submission_latency=0,
+    llm_latencies={},
+    llm_default_latency=0,
+    comments_per_thread=20,
+)
+
+
+def test_percentile_nearest_rank():
+    values = [5.0, 1.0, 4.0, 2.0, 3.0]
+
+    assert percentile(values, 50) == 3.0
+    assert percentile(values, 100) == 5.0
+    assert percentile(values, 0) == 1.0
+
+
+def test_percentile_empty_sample():
+    assert percentile([], 99) == 0.0
+
+
+def test_summarize():
+    summary = summarize([float(i) for i in range(1, 101)])
+
+    assert summary == {"p50": 50.0, "p95": 95.0, "p99": 99.0, "max": 100.0}
+
+
+def test_stub_controller_generates_post_offline():
+    controller = create_stub_controller(FAST_STUBS)
+
+    result = controller.get_random_post_with_llm_response(min_comments=10)
+
+    assert result["metadata"]["total_comments"] == 20
+    assert result["llm_response"].content.startswith("Stub post")
+
+
+def test_stub_controller_surfaces_injected_llm_failures():
+    controller = create_stub_controller(
+        FAST_STUBS.model_copy(update={"llm_error_rate": 1.0})
+    )
+
+    with pytest.raises(Exception, match="Injected Gemini failure"):
+        controller.get_random_post_with_llm_response()
+
+
+def test_create_stub_app_leaves_global_app_untouched():
+    import fastapi_app
+
+    routes_before = len(fastapi_app.app.routes)
+    first = create_stub_app(FAST_STUBS)
+    second = create_stub_app(FAST_STUBS)
+
+    assert len(fastapi_app.app.routes) == routes_before
+    assert not fastapi_app.app.dependency_overrides
+    assert first is not second
+    for app in (first, second):
+        client = TestClient(app)
+        assert client.get("/generate-post").status_code == 200
+        assert "loop_lag" in client.get("/_loadtest/stats").json()
+
+
+def test_stub_app_lifespan_uses_the_stub_controller(monkeypatch):
+    import fastapi_app
+
+    monkeypatch.setenv("ADAPTIVE_HARVESTING", "1")
+    fastapi_app.get_controller.cache_clear()
+
+    with TestClient(create_stub_app(FAST_STUBS)) as client:
+        assert client.get("/generate-post").status_code == 200
+        assert "harvesting" not in client.get("/metrics").json()
+
+    assert fastapi_app.get_controller.cache_info().currsize == 0
@@ -0,0 +1,99 @@
+import json
+from model.models import CommentStructure, ModelRoutingRule, PostSummary
+from service.model_router import ModelRouter, load_routing_rules
+
+RULES = [
+    ModelRoutingRule(model="lite", max_context_chars=1000, max_comments=5),
+    ModelRoutingRule(model="flash", max_context_chars=5000),
+]
+
+
+def test_first_matching_rule_wins():
+    router = ModelRouter(default_model="pro", rules=RULES)
+
+    decision = router.route(context_chars=500, comment_count=3)
+
+    assert decision.model == "lite"
+    assert decision.reason == "rule"
+    assert decision.rule_index == 0
+
+
+def test_comment_limit_moves_request_to_next_rule():
+    router = ModelRouter(default_model="pro", rules=RULES)
+
+    decision = router.route(context_chars=500, comment_count=6)
+
+    assert decision.model == "flash"
+    assert decision.rule_index == 1
+
+
+def test_falls_back_to_default_model():
+    router = ModelRouter(default_model="pro", rules=RULES)
+
+    decision = router.route(context_chars=5001, comment_count=0)
+
+    assert decision.model == "pro"
+    assert decision.reason == "default"
+    assert decision.rule_index is None
+
+
+def test_explicit_model_bypasses_rules():
+    router = ModelRouter(default_model="pro", rules=RULES)
+
+    decision = router.route(context_chars=10, comment_count=0, requested_model="x")
+
+    assert decision.model == "x"
+    assert decision.reason == "explicit"
+
+
+def test_empty_rules_disable_routing():
+    router = ModelRouter(default_model="pro", rules=[])
+
+    assert router.route(context_chars=10, comment_count=0).model == "pro"
+
+
+def test_load_routing_rules(tmp_path):
+    path = tmp_path / "rules.json"
+    path.write_text(json.dumps([{"model": "lite", "max_comments": 2}]))
+
+    rules = load_routing_rules(str(path))
+
+    assert rules == [ModelRoutingRule(model="lite", max_comments=2)]
+
+
+def test_count_comments_includes_nested_replies():
+    summary = PostSummary(
+        post_title="title",
+        post_body="body",
+        children=[
+            CommentStructure(
+                comment="a",
+                children=[
+                    CommentStructure(
+                        comment="b", children=[CommentStructure(comment="c")]
+                    )
+                ],
+            ),
+            CommentStructure(comment="d"),
+        ],
+    )
+
+    assert summary.count_comments() == 4
+
+
+def test_count_comments_empty_summary():
+    assert PostSummary(post_title="title", post_body="").count_comments() == 0
+
+
+def test_llm_service_reads_routing_rules_file(tmp_path, monkeypatch):
+    from service.llm_service import LLMService
+
+    path = tmp_path / "rules.json"
+    path.write_text(json.dumps([{"model": "lite", "max_context_chars": 10}]))
+    monkeypatch.setenv("GEMINI_API_KEY", "test")
+    monkeypatch.setenv("ROUTING_RULES_FILE", str(path))
+
+    service = LLMService()
+
+    expected = [ModelRoutingRule(model="lite", max_context_chars=10)]
+    assert service.router.rules == expected
@@ -0,0 +1,42 @@
+import threading
+from controller.post_controller import PostController
+from loadtest.stubs import StubConfig, StubLLMService, StubRedditService
+
+
+def make_controller(**kwargs) -> PostController:
+    return PostController(llm_service=StubLLMService(StubConfig()), **kwargs)
+
+
+def test_each_thread_gets_its_own_reddit_service():
+    created = []
+
+    def factory():
+        created.append(StubRedditService())
+        return created[-1]
+
+    controller = make_controller(reddit_service_factory=factory)
+    seen = []
+    threads = [
+        threading.Thread(target=lambda: seen.append(controller.reddit_service))
+        for _ in range(3)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert controller.reddit_service is controller.reddit_service
+    assert len({id(service) for service in seen}) == 3
+    assert len(created) == 4
+
+
+def test_shared_reddit_service_is_used_by_every_thread():
+    shared = StubRedditService()
+    controller = make_controller(reddit_service=shared)
+    seen = []
+    thread = threading.Thread(target=lambda: seen.append(controller.reddit_service))
+    thread.start()
+    thread.join()
+
+    assert seen == [shared]
+    assert controller.reddit_service is shared
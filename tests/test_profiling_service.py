@@ -0,0 +1,93 @@
+import threading
+import time
+from fastapi.testclient import TestClient
+from loadtest.stubs import StubConfig, create_stub_app
+from service.profiling_service import ProfileSession, ProfilingService
+
+
+def busy_request_work(seconds: float) -> None:
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+def busy_background_work(stop: threading.Event) -> None:
+    while not stop.is_set():
+        pass
+
+
+def test_session_samples_only_the_profiled_thread(tmp_path):
+    service = ProfilingService(str(tmp_path), interval=0.001)
+    stop = threading.Event()
+    background = threading.Thread(target=busy_background_work, args=(stop,))
+    background.start()
+    try:
+        with ProfileSession(service, enabled=True) as session:
+            busy_request_work(0.2)
+    finally:
+        stop.set()
+        background.join()
+
+    summary = session.summary
+    functions = {hot.function for hot in summary.hot_functions}
+    assert "busy_request_work" in functions
+    assert "busy_background_work" not in functions
+    assert summary.samples > 0
+    assert summary.hot_functions[0].function == "busy_request_work"
+
+    with open(summary.path) as f:
+        lines = f.read().splitlines()
+    assert any("busy_request_work" in line for line in lines)
+    assert not any("busy_background_work" in line for line in lines)
+    assert sum(int(line.rsplit(" ", 1)[1]) for line in lines) == summary.samples
+
+
+def test_disabled_session_does_not_profile(tmp_path):
+    service = ProfilingService(str(tmp_path))
+
+    with ProfileSession(service, enabled=False) as session:
+        busy_request_work(0.01)
+    with ProfileSession(None, enabled=True) as unconfigured:
+        busy_request_work(0.01)
+
+    assert session.summary is None
+    assert unconfigured.summary is None
+    assert service.list_profiles() == []
+
+
+def test_old_profiles_are_pruned(tmp_path):
+    service = ProfilingService(str(tmp_path), max_profiles=2, interval=0.001)
+
+    for _ in range(4):
+        with ProfileSession(service, enabled=True) as session:
+            busy_request_work(0.01)
+
+    profiles = service.list_profiles()
+    assert len(profiles) == 2
+    assert profiles[-1] == session.summary.path
+
+
+def test_profile_header_requires_profile_dir(tmp_path):
+    app = create_stub_app(
+        StubConfig(
+            reddit_listing_latency=0,
+            reddit_submission_latency=0,
+            llm_latencies={},
+            llm_default_latency=0,
+        )
+    )
+    client = TestClient(app)
+    headers = {"X-Profile": "1"}
+
+    response = client.get("/generate-post", headers=headers)
+    assert response.status_code == 400
+    assert "PROFILE_DIR" in response.json()["detail"]
+
+    from fastapi_app import get_controller
+
+    app.dependency_overrides[get_controller]().profiler = ProfilingService(
+        str(tmp_path)
+    )
+    response = client.get("/generate-post", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["metadata"]["profile"]["profile_id"]
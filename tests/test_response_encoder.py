@@ -0,0 +1,113 @@
+import asyncio
+import gzip
+import json
+import pytest
+from model.models import RedditSubmission
+from service.response_encoder import (
+    compress,
+    encode_response,
+    negotiate_encoding,
+    parse_fields,
+    select_fields,
+)
+
+RESULT = {
+    "submission": RedditSubmission(
+        subreddit="aws", title="title", score=1, id="s1", comments=2, body="body"
+    ),
+    "comments": ["a", "b"],
+    "post_summary": {"post_title": "title"},
+    "llm_response": {"content": "post"},
+    "metadata": {"subreddit": "aws"},
+}
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        ("gzip, deflate, br", "br"),
+        ("gzip;q=1.0, br;q=0.5", "gzip"),
+        ("br;q=0, gzip", "gzip"),
+        ("*", "br"),
+        ("*;q=0.5, gzip;q=0", "br"),
+        ("identity", None),
+        ("", None),
+    ],
+)
+def test_negotiate_encoding(header, expected):
+    assert negotiate_encoding(header) == expected
+
+
+def test_parse_fields():
+    assert parse_fields(None) is None
+    assert parse_fields(" llm_response, metadata ,") == ["llm_response", "metadata"]
+    with pytest.raises(ValueError, match="Unknown fields: nope"):
+        parse_fields("metadata,nope")
+
+
+def test_parse_fields_rejects_full_fields_in_compact_mode():
+    assert parse_fields("llm_response", compact=True) == ["llm_response"]
+    with pytest.raises(ValueError, match="Unknown compact fields: comments"):
+        parse_fields("comments", compact=True)
+
+
+def test_select_fields_full_and_compact():
+    assert list(select_fields(RESULT)) == list(RESULT)
+
+    compact = select_fields(RESULT, compact=True)
+
+    assert list(compact) == ["submission", "llm_response", "metadata"]
+    assert "body" not in compact["submission"]
+
+
+def test_select_fields_cannot_bypass_compact_mode():
+    payload = select_fields(RESULT, compact=True, fields=["comments", "metadata"])
+
+    assert list(payload) == ["metadata"]
+
+
+def test_encode_response_compresses_large_payloads():
+    payload = {"text": "x" * 4096}
+
+    body, headers = encode_response(payload, "gzip")
+
+    assert headers["Content-Encoding"] == "gzip"
+    assert json.loads(gzip.decompress(body)) == payload
+    assert int(headers["X-Uncompressed-Bytes"]) > len(body)
+
+
+def test_encode_response_skips_small_payloads():
+    body, headers = encode_response({"text": "x"}, "gzip")
+
+    assert "Content-Encoding" not in headers
+    assert compress(body, None) == body
+    assert json.loads(body) == {"text": "x"}
+
+
+def test_generate_post_encodes_off_the_event_loop(monkeypatch):
+    import fastapi_app
+    from fastapi.testclient import TestClient
+    from loadtest.stubs import StubConfig, create_stub_app
+
+    on_event_loop = []
+    original = fastapi_app.encode_response
+
+    def recording_encode_response(*args, **kwargs):
+        try:
+            asyncio.get_running_loop()
+            on_event_loop.append(True)
+        except RuntimeError:
+            on_event_loop.append(False)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(fastapi_app, "encode_response", recording_encode_response)
+    config = StubConfig(
+        reddit_listing_latency=0,
+        reddit_submission_latency=0,
+        llm_latencies={},
+        llm_default_latency=0,
+    )
+    client = TestClient(create_stub_app(config))
+
+    assert client.get("/generate-post").status_code == 200
+    assert on_event_loop == [False]